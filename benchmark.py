@@ -0,0 +1,290 @@
+"""
+Mede o desempenho dos backends do solver e do gerador sobre corpora fixos.
+
+Uso:
+    python benchmark.py
+    python benchmark.py --output results.json
+    python benchmark.py --compare results.json --tolerance 0.2 --min-delta-ms 1
+"""
+import os
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+from src.core.game import SudokuGame, DIFFICULTY_SETTINGS
+from src.core.solver import SudokuSolver, BACKENDS
+
+# Corpora fixos (81 caracteres por puzzle, "0" ou "." = vazio); todos conferidos com
+# count_solutions: solução única, exceto em "unsolvable", que não tem nenhuma
+CORPORA = {
+    "easy": [
+        "003020600900305001001806400008102900700000008006708200002609500800203009005010300",
+        "200080300060070084030500209000105408000000000402706000301007040720040060004010003",
+        "000000907000420180000705026100904000050000040000507009920108000034059000507000000",
+        "030050040008010500460000012070502080000603000040109030250000098001020600080060020",
+    ],
+    # Mínimo de pistas possível para solução única
+    "17-clue": [
+        "000000010400000000020000000000050407008000300001090000300400200050100000000806000",
+        "000000010400000000020000000000050604008000300001090000300400200050100000000807000",
+        "000000012000035000000600070700000300000400800100000000000120000080000040050000600",
+        "000000012003600000000007000410020000000500300700000600280000040000300500000000000",
+        "000000012008030000000000040120500000000004700060000000507000300000620000000100000",
+        "000000012040050000000009000070600400000100000000000050000087500601000300200000000",
+        "000000012050400000000000030700600400001000000000080000920000800000510700000003000",
+    ],
+    # Inkala 2012, AI Escargot, Norvig, Easter Monster e outros conhecidos por travar solvers
+    "hardest": [
+        "800000000003600000070090200050007000000045700000100030001000068008500010090000400",
+        "100007090030020008009600500005300900010080002600004000300000010040000007007000300",
+        "4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......",
+        "1.......2.9.4...5...6...7...5.9.3.......7.......85..4.7.....6...3...9.8...2.....1",
+        "85...24..72......9..4.........1.7..23.5...9...4...........8..7..17..........36.4.",
+        "..53.....8......2..7..1.5..4....53...1..7...6..32...8..6.5....9..4....3......97..",
+        "12.3....435....1....4........54..2..6...7.........8.9...31..5.......9.7.....6...8",
+    ],
+    # Pistas sem repetição mas sem solução, célula sem candidatos e pista repetida
+    "unsolvable": [
+        "003020600900305081001806400008102900700000008006708200002609500800203009005010300",
+        "000000010400001000020000000000050407008000300001090000300400200050100000000806000",
+        "100007094030020008009600500005300900010080002600004000300000010040000007007000300",
+        "123456780000000009000000000000000000000000000000000000000000000000000000000000000",
+        "110000000000000000000000000000000000000000000000000000000000000000000000000000000",
+    ],
+}
+
+# Métricas comparadas com o baseline: (nome, True se maior é melhor, usa tolerância)
+# Nós visitados são determinísticos (candidatos em ordem fixa), então qualquer aumento conta
+COMPARED = [("throughput", True, True), ("p50_ms", False, True), ("p95_ms", False, True),
+            ("mean_nodes", False, False), ("peak_kib", False, True)]
+
+# Diferença de tempo por puzzle (ms) abaixo da qual uma métrica de tempo não é
+# regressão: em puzzles de fração de ms, o ruído sozinho passa de 40%
+MIN_DELTA_MS = 1.0
+
+
+def parse(puzzle):
+    """Linha de 81 caracteres -> tabuleiro 9x9"""
+    return np.array([0 if c in ".0" else int(c) for c in puzzle], dtype=int).reshape(9, 9)
+
+
+def summarize(latencies, nodes, peak, failures):
+    """Estatísticas de uma série de execuções (latências em segundos)"""
+    latencies = np.asarray(latencies)
+    ms = latencies * 1000
+    return {
+        "count": len(latencies),
+        "throughput": len(latencies) / latencies.sum() if latencies.sum() else 0.0,
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p95_ms": float(np.percentile(ms, 95)),
+        "p99_ms": float(np.percentile(ms, 99)),
+        "mean_nodes": float(np.mean(nodes)) if nodes else None,
+        "peak_kib": peak / 1024,
+        "failures": failures,
+    }
+
+
+def calibrate(repeat=3, n=200_000):
+    """
+    Tempo (ms) de um laço Python fixo, o melhor de `repeat`: mede a velocidade
+    da máquina naquele momento, para a comparação descontar CPU mais lenta ou
+    disputada em vez de acusar regressão
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        total = 0
+        for i in range(n):
+            total += i & 7
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def peak_memory(run):
+    """Pico de memória alocada (bytes) durante run(), medido à parte do tempo"""
+    tracemalloc.start()
+    try:
+        run()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_solver(backend, corpus, repeat):
+    """
+    Resolve cada puzzle do corpus `repeat` vezes com candidatos em ordem fixa;
+    a latência de cada puzzle é a melhor das repetições (como no timeit), que
+    descarta interrupções do sistema operacional
+    """
+    boards = [parse(p) for p in CORPORA[corpus]]
+    expect_solved = corpus != "unsolvable"
+    latencies, nodes = [], []
+    failures = 0
+
+    for board in boards:
+        best = float("inf")
+        for _ in range(repeat):
+            solver = SudokuSolver(board.copy(), backend, randomize=False)
+            start = time.perf_counter()
+            solved = solver.solve_visually()
+            best = min(best, time.perf_counter() - start)
+            failures += solved != expect_solved
+        latencies.append(best)
+        nodes.append(solver.nodes)
+
+    def run_all():
+        for board in boards:
+            SudokuSolver(board.copy(), backend, randomize=False).solve_visually()
+
+    return summarize(latencies, nodes, peak_memory(run_all), failures)
+
+
+def bench_generator(difficulty, runs, seed, repeat=1):
+    """
+    Gera `runs` tabuleiros da dificuldade com seeds fixas; cada tabuleiro é
+    gerado `repeat` vezes com a mesma seed e vale a melhor latência
+    """
+    latencies = []
+    for k in range(runs):
+        best = float("inf")
+        for _ in range(repeat):
+            random.seed(f"{seed}-{difficulty}-{k}")
+            start = time.perf_counter()
+            SudokuGame(None, difficulty)
+            best = min(best, time.perf_counter() - start)
+        latencies.append(best)
+
+    random.seed(f"{seed}-{difficulty}-memory")
+    peak = peak_memory(lambda: SudokuGame(None, difficulty))
+    return summarize(latencies, [], peak, 0)
+
+
+def run_benchmarks(repeat, generator_runs, seed, log=sys.stderr):
+    results = {}
+    for backend in BACKENDS:
+        for corpus in CORPORA:
+            key = f"solver/{backend}/{corpus}"
+            calibration = calibrate()
+            results[key] = bench_solver(backend, corpus, repeat)
+            results[key]["calibration_ms"] = (calibration + calibrate()) / 2
+            print(f"{key}: ok", file=log)
+    for difficulty in DIFFICULTY_SETTINGS:
+        key = f"generator/{difficulty}"
+        calibration = calibrate()
+        results[key] = bench_generator(difficulty, generator_runs, seed, repeat)
+        results[key]["calibration_ms"] = (calibration + calibrate()) / 2
+        print(f"{key}: ok", file=log)
+    return results
+
+
+def print_table(results, out=sys.stdout):
+    header = f"{'alvo':<36}{'puzzles/s':>11}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'nós':>10}{'pico KiB':>10}"
+    print(header, file=out)
+    print("-" * len(header), file=out)
+    for key, r in results.items():
+        nodes = f"{r['mean_nodes']:.0f}" if r["mean_nodes"] is not None else "-"
+        line = (f"{key:<36}{r['throughput']:>11.1f}{r['p50_ms']:>9.2f}{r['p95_ms']:>9.2f}"
+                f"{r['p99_ms']:>9.2f}{nodes:>10}{r['peak_kib']:>10.1f}")
+        if r["failures"]:
+            line += f"  ({r['failures']} resultados inesperados)"
+        print(line, file=out)
+
+
+def time_delta_ms(metric, old, new):
+    """Diferença de tempo por puzzle (ms) de uma métrica de tempo; None nas outras"""
+    if metric == "throughput":
+        return abs(1000 / new - 1000 / old) if new else None
+    if metric.endswith("_ms"):
+        return abs(new - old)
+    return None
+
+
+def compare(results, baseline, tolerance, min_delta_ms=MIN_DELTA_MS):
+    """
+    Lista as métricas que pioraram mais que `tolerance` (fração) em relação ao
+    baseline; métricas de tempo são corrigidas pela calibração da máquina
+    (calibration_ms) e só contam se a diferença passar de `min_delta_ms`
+    """
+    regressions = []
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        if current["failures"] > previous.get("failures", 0):
+            regressions.append(f"{key}: {current['failures']} resultados inesperados")
+        # Quanto a máquina estava mais rápida (>1) ou lenta (<1) que no baseline
+        speed = 1.0
+        if previous.get("calibration_ms") and current.get("calibration_ms"):
+            speed = previous["calibration_ms"] / current["calibration_ms"]
+        for metric, higher_is_better, tolerant in COMPARED:
+            old, new = previous.get(metric), current.get(metric)
+            if old is None or new is None or old == 0:
+                continue
+            if metric == "throughput":
+                new = new / speed
+            elif metric.endswith("_ms"):
+                new = new * speed
+            change = (new - old) / old
+            limit = tolerance if tolerant else 0.0
+            delta = time_delta_ms(metric, old, new)
+            if delta is not None and delta < min_delta_ms:
+                continue
+            if (change < -limit) if higher_is_better else (change > limit):
+                regressions.append(f"{key}: {metric} {old:.2f} -> {new:.2f} ({change:+.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do solver e do gerador de Sudoku")
+    parser.add_argument("--repeat", type=int, default=5, help="execuções por puzzle e por tabuleiro gerado (vale a melhor)")
+    parser.add_argument("--generator-runs", type=int, default=30, help="tabuleiros gerados por dificuldade")
+    parser.add_argument("--seed", type=int, default=0, help="seed do gerador")
+    parser.add_argument("--output", help="grava os resultados em JSON")
+    parser.add_argument("--compare", metavar="BASELINE", help="JSON de uma execução anterior")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="piora tolerada na comparação (fração)")
+    parser.add_argument("--min-delta-ms", type=float, default=MIN_DELTA_MS,
+                        help="diferença de tempo por puzzle (ms) ignorada na comparação")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.repeat, args.generator_runs, args.seed)
+    print_table(results)
+
+    if args.output:
+        report = {
+            "meta": {
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "repeat": args.repeat,
+                "generator_runs": args.generator_runs,
+                "seed": args.seed,
+            },
+            "results": results,
+        }
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Resultados gravados em {args.output}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.tolerance, args.min_delta_ms)
+        if regressions:
+            print("\nRegressões em relação ao baseline:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("\nSem regressões em relação ao baseline")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""
+Gera um banco de puzzles offline, sem abrir janela.
+
+Uso:
+    python generate_bank.py --per-difficulty 1000 --output puzzles.bank
+    python generate_bank.py --per-difficulty 1000 --output puzzles.bank --resume
+    python generate_bank.py --output puzzles.bank --index-only
+"""
+import os
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import random
+import sys
+import time
+from multiprocessing import Pool
+
+import numpy as np
+from src.core.game import SudokuGame, DIFFICULTY_SETTINGS
+from src.core.bank import BankWriter, build_index, pack_records
+from src.core.grader import TECHNIQUE_RANK
+
+
+def make_jobs(per_difficulty, chunk):
+    """Lista fixa de blocos (dificuldade, índice, tamanho) na ordem de escrita"""
+    jobs = []
+    for difficulty in DIFFICULTY_SETTINGS:
+        for index, start in enumerate(range(0, per_difficulty, chunk)):
+            jobs.append((difficulty, index, min(chunk, per_difficulty - start)))
+    return jobs
+
+
+def generate_chunk(job):
+    """
+    Gera um bloco de puzzles com seed determinística e devolve os registros e
+    quantos não atingiram a técnica mínima da dificuldade (só com by_grade)
+    """
+    difficulty, index, size, seed, by_grade = job
+    random.seed(f"{seed}-{difficulty}-{index}")
+
+    boards = np.zeros((size, 9, 9), dtype=np.uint8)
+    solutions = np.zeros((size, 9, 9), dtype=np.uint8)
+    hidden = np.zeros((size, 9, 9), dtype=bool)
+    ranks = np.zeros(size, dtype=np.uint8)
+    missed = 0
+    for i in range(size):
+        game = SudokuGame(None, difficulty, by_grade=by_grade)
+        boards[i] = game.board
+        solutions[i] = game.solution
+        ranks[i] = TECHNIQUE_RANK[game.grade[1]]
+        missed += game.grade_met is False
+        for row, col in game.hidden_cells:
+            hidden[i, row, col] = True
+
+    return pack_records(difficulty, boards, solutions, hidden, ranks), missed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera um banco binário de puzzles de Sudoku")
+    parser.add_argument("--per-difficulty", type=int, default=1000, help="puzzles por dificuldade")
+    parser.add_argument("--output", default="puzzles.bank", help="arquivo do banco")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="processos de geração")
+    parser.add_argument("--chunk", type=int, default=500, help="puzzles por bloco de trabalho")
+    parser.add_argument("--seed", type=int, default=0, help="seed base")
+    parser.add_argument("--resume", action="store_true", help="continua um banco interrompido")
+    parser.add_argument("--by-grade", action="store_true", help="mira a técnica exigida em vez do nº de pistas")
+    parser.add_argument("--index-only", action="store_true", help="apenas refaz o índice do banco")
+    args = parser.parse_args()
+
+    if args.index_only:
+        build_index(args.output)
+        print(f"Índice refeito em {args.output}", file=sys.stderr)
+        return 0
+
+    # Gera num arquivo temporário: o jogo nunca vê um banco incompleto ou sem índice
+    partial = args.output + ".tmp"
+    writer = BankWriter(partial, args.seed, args.per_difficulty, args.chunk, args.resume, args.by_grade)
+    jobs = make_jobs(args.per_difficulty, args.chunk)
+    total = sum(size for _, _, size in jobs)
+
+    # Pula os blocos que já estão no arquivo
+    done = 0
+    skip = 0
+    for _, _, size in jobs:
+        if done + size > writer.count:
+            break
+        done += size
+        skip += 1
+    if done != writer.count:
+        writer.rewind(done)  # Bloco incompleto é gerado de novo
+
+    pending = [(d, i, size, args.seed, args.by_grade) for d, i, size in jobs[skip:]]
+    if done:
+        print(f"Retomando: {done}/{total} puzzles já gerados", file=sys.stderr)
+
+    start = time.perf_counter()
+    generated = 0
+    missed = 0
+    try:
+        with Pool(args.workers) as pool:
+            for records, chunk_missed in pool.imap(generate_chunk, pending):
+                writer.append(records)
+                generated += len(records)
+                missed += chunk_missed
+
+                elapsed = time.perf_counter() - start
+                rate = generated / elapsed
+                eta = (total - writer.count) / rate if rate else 0
+                print(f"{writer.count}/{total} ({writer.count / total:.1%}) "
+                      f"{rate:.0f} puzzles/s, faltam {eta:.0f} s", file=sys.stderr)
+    except KeyboardInterrupt:
+        print(f"\nInterrompido com {writer.count} puzzles; use --resume para continuar",
+              file=sys.stderr)
+        return 1
+    finally:
+        writer.close()
+
+    build_index(partial)
+    os.replace(partial, args.output)
+    print(f"Banco completo: {writer.count} puzzles em {args.output}", file=sys.stderr)
+    if missed:
+        print(f"{missed} puzzles gerados nesta execução ficaram abaixo da técnica mínima "
+              f"da dificuldade (a técnica real está no banco)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,19 @@
+import os
+import time
 import pygame
 from src.ui.menu import Menu
 from src.ui.difficulty_menu import DifficultyMenu
 from src.ui.about_screen import AboutScreen
 from src.ui.game_screen import GameScreen
+from src.ui.assets import ASSETS
+from src.ui.settings import POOL_SIZE, POOL_LOW_WATERMARK, BANK_PATH, BOARD_ORDER, SAVE_PATH
+from src.core.pool import PuzzlePool
+from src.core.bank import PuzzleBank
+from src.core.save import load_save, delete_save
+from src.core.solve_cache import SOLVE_CACHE
 
 def main():
+    start = time.perf_counter()
     pygame.init()
     print("PyGame inicializado")  # Debug
     
@@ -15,28 +24,63 @@ def main():
     pygame.display.set_caption("Sudoku 8-bit")
     print("Tela principal criada")  # Debug
     
+    # Usa o banco pré-gerado se existir; senão pré-gera puzzles em segundo plano
+    puzzle_bank = None
+    if BOARD_ORDER == 3 and os.path.exists(BANK_PATH):
+        try:
+            puzzle_bank = PuzzleBank(BANK_PATH)
+            print(f"Banco de puzzles carregado: {puzzle_bank.count} puzzles")  # Debug
+        except (ValueError, OSError) as e:
+            print(f"Ignorando {BANK_PATH}: {e}; usando o pool de puzzles")
+    puzzle_pool = PuzzlePool(POOL_SIZE, POOL_LOW_WATERMARK)
+    if puzzle_bank is None and BOARD_ORDER == 3:
+        puzzle_pool.start()
+    
     # Cria os menus e telas
     print("Criando menus...")  # Debug
     main_menu = Menu(screen)
     difficulty_menu = DifficultyMenu(screen)
     about_screen = AboutScreen(screen)
+    print(f"Inicialização em {(time.perf_counter() - start) * 1000:.0f} ms; assets: {ASSETS.stats()}")  # Debug
     
     # Loop principal do jogo
     print("Iniciando loop principal")  # Debug
     while True:
         print("\nExecutando menu principal")  # Debug
-        main_action = main_menu.run()
+        main_action = main_menu.run(can_resume=os.path.exists(SAVE_PATH))
         print(f"Ação do menu principal: {main_action}")  # Debug
         
-        if main_action == "game":
+        if main_action == "resume":
+            resume_start = time.perf_counter()
+            saved = load_save(SAVE_PATH)
+            if saved is None:
+                delete_save(SAVE_PATH)  # Corrompido: volta ao menu, agora sem CONTINUAR
+                continue
+            game_screen = GameScreen.resume(screen, saved)
+            print(f"Partida retomada em {(time.perf_counter() - resume_start) * 1000:.0f} ms")  # Debug
+            game_screen.run()
+        elif main_action == "game":
             print("Menu de dificuldade selecionado")  # Debug
             difficulty = difficulty_menu.run()
             print(f"Dificuldade selecionada: {difficulty}")  # Debug
             
             if difficulty in ["fácil", "médio", "difícil"]:
                 print(f"Iniciando jogo no modo {difficulty}")
-                game_screen = GameScreen(screen, difficulty)
+                game_start = time.perf_counter()
+                if BOARD_ORDER != 3:
+                    game_screen = GameScreen(screen, difficulty, order=BOARD_ORDER)
+                elif puzzle_bank is not None:
+                    game_screen = GameScreen(screen, difficulty, bank=puzzle_bank)
+                else:
+                    puzzle = puzzle_pool.take(difficulty)  # None gera na hora
+                    game_screen = GameScreen(screen, difficulty, puzzle)
+                print(f"Jogo pronto em {(time.perf_counter() - game_start) * 1000:.0f} ms; "
+                      f"assets: {ASSETS.stats()}")  # Debug
                 game_screen.run()
+                print(f"Loop do jogo: {game_screen.loop.stats()}")  # Debug
+                print(f"Cache do solver: {SOLVE_CACHE.stats()}")  # Debug
+                if puzzle_bank is None and BOARD_ORDER == 3:
+                    print(f"Pool de puzzles: {puzzle_pool.stats()[difficulty]}")  # Debug
             elif difficulty == "back":
                 print("Voltando ao menu principal")  # Debug
                 continue  # Volta para o menu principal
@@ -46,6 +90,7 @@ def main():
             print("Retornou da tela SOBRE")  # Debug
         elif main_action == "SAIR":
             print("Saindo do jogo")  # Debug
+            puzzle_pool.stop()
             pygame.quit()
             return
 
@@ -0,0 +1,117 @@
+"""
+Resolve puzzles em lote sem abrir janela (não importa o pygame).
+
+Lê um puzzle por linha (81 caracteres, "0" ou "." = vazio) de um arquivo ou da
+entrada padrão e escreve uma linha por puzzle na saída padrão, na mesma ordem:
+a solução com 81 dígitos ou "erro: <motivo>". Linhas em branco são ignoradas.
+
+Uso:
+    python solve.py puzzles.txt > solucoes.txt
+    cat puzzles.txt | python solve.py --workers 4 --backend dlx
+"""
+import argparse
+import itertools
+import os
+import sys
+import time
+from collections import deque
+from multiprocessing import Pool
+
+import numpy as np
+from src.core.solver import SudokuSolver, BACKENDS
+from src.core.search import EXHAUSTED
+
+DIGITS = set("0123456789.")
+
+
+def solve_line(line, backend="dlx", max_nodes=None):
+    """Puzzle de 81 caracteres -> linha de saída (solução ou erro)"""
+    if len(line) != 81:
+        return f"erro: linha inválida ({len(line)} caracteres em vez de 81)"
+    if not set(line) <= DIGITS:
+        return "erro: linha inválida (caracteres fora de 0-9 e .)"
+
+    board = np.array([0 if c == "." else int(c) for c in line], dtype=int).reshape(9, 9)
+    solver = SudokuSolver(board, backend, randomize=False)
+    if not solver.consistent:
+        return "erro: pistas repetidas"
+    if solver.solve_visually(max_nodes=max_nodes):
+        return "".join(str(v) for v in solver.values)
+    if solver.result == EXHAUSTED:
+        return "erro: limite de nós atingido"
+    return "erro: sem solução"
+
+
+def solve_chunk(job):
+    """Resolve um bloco de linhas num processo do pool"""
+    lines, backend, max_nodes = job
+    return [solve_line(line, backend, max_nodes) for line in lines]
+
+
+def read_chunks(stream, size):
+    """Blocos de até `size` linhas não vazias, lidos sob demanda"""
+    lines = (line.strip() for line in stream)
+    lines = (line for line in lines if line)
+    while True:
+        chunk = list(itertools.islice(lines, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resolve puzzles de Sudoku em lote, sem interface")
+    parser.add_argument("input", nargs="?", help="arquivo de puzzles (padrão: entrada padrão)")
+    parser.add_argument("--backend", choices=BACKENDS, default="dlx", help="motor de resolução")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="processos de resolução")
+    parser.add_argument("--chunk", type=int, default=200, help="puzzles por bloco de trabalho")
+    parser.add_argument("--max-nodes", type=int, help="limite de nós por puzzle")
+    args = parser.parse_args()
+
+    stream = open(args.input) if args.input else sys.stdin
+    out = sys.stdout
+    # Blocos em processamento ao mesmo tempo: a memória não cresce com a entrada
+    max_in_flight = 2 * max(args.workers, 1)
+
+    start = time.perf_counter()
+    total = errors = 0
+
+    def emit(results):
+        nonlocal total, errors
+        for result in results:
+            out.write(result + "\n")
+            total += 1
+            errors += result.startswith("erro")
+
+    try:
+        chunks = ((chunk, args.backend, args.max_nodes) for chunk in read_chunks(stream, args.chunk))
+        if args.workers <= 1:
+            for job in chunks:
+                emit(solve_chunk(job))
+        else:
+            with Pool(args.workers) as pool:
+                pending = deque()
+                for job in chunks:
+                    pending.append(pool.apply_async(solve_chunk, (job,)))
+                    # Escreve em ordem assim que o bloco mais antigo fica pronto
+                    while len(pending) >= max_in_flight or (pending and pending[0].ready()):
+                        emit(pending.popleft().get())
+                while pending:
+                    emit(pending.popleft().get())
+    except KeyboardInterrupt:
+        print(f"\nInterrompido depois de {total} puzzles", file=sys.stderr)
+        return 1
+    finally:
+        out.flush()
+        if stream is not sys.stdin:
+            stream.close()
+
+    elapsed = time.perf_counter() - start
+    rate = total / elapsed if elapsed else 0
+    print(f"{total} puzzles ({errors} com erro) em {elapsed:.1f} s, {rate:.0f} puzzles/s",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
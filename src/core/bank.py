@@ -0,0 +1,241 @@
+import os
+import struct
+import numpy as np
+from .game import DIFFICULTY_SETTINGS
+
+# Formato do banco de puzzles:
+#   cabeçalho de 64 bytes + registros de tamanho fixo
+#   registro: dificuldade (1) + pistas (1) + tabuleiro (41) + solução (41)
+#             + máscara das células escondidas (11) + técnica mais difícil (1,
+#             posição em TECHNIQUE_RANK; 0 = não avaliado)
+MAGIC = b"SDKB"
+VERSION = 1
+# magic, versão, registro, total, índice, seed, M, bloco, flags (BANK_BY_GRADE)
+HEADER = struct.Struct("<4sHHQQQIIB")
+HEADER_SIZE = 64
+RECORD_SIZE = 96
+
+# Flags do cabeçalho; bancos antigos têm o byte zerado (gerados sem --by-grade)
+BANK_BY_GRADE = 1
+
+DIFFICULTY_IDS = {name: i for i, name in enumerate(DIFFICULTY_SETTINGS)}
+DIFFICULTY_NAMES = list(DIFFICULTY_SETTINGS)
+
+
+def pack_digits(boards):
+    """(n, 9, 9) dígitos -> (n, 41) bytes com dois dígitos por byte"""
+    flat = np.zeros((len(boards), 82), dtype=np.uint8)
+    flat[:, :81] = np.asarray(boards).reshape(len(boards), 81)
+    return (flat[:, 0::2] << 4) | flat[:, 1::2]
+
+
+def unpack_digits(packed):
+    """(n, 41) bytes -> (n, 9, 9) dígitos"""
+    flat = np.empty((len(packed), 82), dtype=np.uint8)
+    flat[:, 0::2] = packed >> 4
+    flat[:, 1::2] = packed & 0x0F
+    return flat[:, :81].reshape(len(packed), 9, 9)
+
+
+def pack_records(difficulty, boards, solutions, hidden, ranks=None):
+    """Empacota n puzzles da mesma dificuldade em registros (n, RECORD_SIZE)"""
+    n = len(boards)
+    hidden = np.asarray(hidden, dtype=bool).reshape(n, 81)
+    records = np.zeros((n, RECORD_SIZE), dtype=np.uint8)
+    records[:, 0] = DIFFICULTY_IDS[difficulty]
+    records[:, 1] = 81 - hidden.sum(axis=1)
+    records[:, 2:43] = pack_digits(boards)
+    records[:, 43:84] = pack_digits(solutions)
+    records[:, 84:95] = np.packbits(hidden, axis=1)
+    if ranks is not None:
+        records[:, 95] = ranks
+    return records
+
+
+def unpack_records(records):
+    """Registros (n, RECORD_SIZE) -> (boards, solutions, hidden)"""
+    records = np.asarray(records, dtype=np.uint8).reshape(-1, RECORD_SIZE)
+    boards = unpack_digits(records[:, 2:43])
+    solutions = unpack_digits(records[:, 43:84])
+    hidden = np.unpackbits(records[:, 84:95], axis=1, count=81).astype(bool)
+    return boards, solutions, hidden.reshape(-1, 9, 9)
+
+
+def read_header(f):
+    """Lê o cabeçalho de um banco aberto em modo binário"""
+    f.seek(0)
+    data = f.read(HEADER_SIZE)
+    if len(data) < HEADER_SIZE:
+        raise ValueError("Arquivo de banco truncado")
+    magic, version, record_size, count, index_offset, seed, per_difficulty, chunk, flags = \
+        HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION or record_size != RECORD_SIZE:
+        raise ValueError("Arquivo não é um banco de puzzles compatível")
+    return {
+        "count": count, "index_offset": index_offset, "seed": seed,
+        "per_difficulty": per_difficulty, "chunk": chunk,
+        "by_grade": bool(flags & BANK_BY_GRADE)
+    }
+
+
+def write_header(f, count, index_offset, seed, per_difficulty, chunk, by_grade=False):
+    """Escreve o cabeçalho no início do arquivo"""
+    flags = BANK_BY_GRADE if by_grade else 0
+    data = HEADER.pack(MAGIC, VERSION, RECORD_SIZE, count, index_offset, seed, per_difficulty, chunk, flags)
+    f.seek(0)
+    f.write(data.ljust(HEADER_SIZE, b"\0"))
+
+
+class BankWriter:
+    """
+    Escreve registros em sequência e atualiza o total no cabeçalho a cada bloco,
+    para que uma geração interrompida possa ser retomada.
+    """
+
+    def __init__(self, path, seed, per_difficulty, chunk, resume=False, by_grade=False):
+        self.seed = seed
+        self.per_difficulty = per_difficulty
+        self.chunk = chunk
+        self.by_grade = by_grade
+
+        if resume and os.path.exists(path):
+            self.file = open(path, "r+b")
+            header = read_header(self.file)
+            if ((header["seed"], header["per_difficulty"], header["chunk"], header["by_grade"])
+                    != (seed, per_difficulty, chunk, by_grade)):
+                self.file.close()
+                raise ValueError("Parâmetros diferentes dos usados no banco existente")
+            # Só conta registros que chegaram inteiros ao disco
+            available = (os.path.getsize(path) - HEADER_SIZE) // RECORD_SIZE
+            self.rewind(min(header["count"], available))
+        else:
+            self.file = open(path, "w+b")
+            self.rewind(0)
+
+    def rewind(self, count):
+        """Descarta tudo depois do registro `count` (inclusive um índice antigo)"""
+        self.count = count
+        self.file.truncate(HEADER_SIZE + count * RECORD_SIZE)
+        self.write_header()
+        self.file.flush()
+
+    def write_header(self, index_offset=0):
+        write_header(self.file, self.count, index_offset, self.seed, self.per_difficulty, self.chunk,
+                     self.by_grade)
+
+    def append(self, records):
+        """Acrescenta um bloco de registros e confirma o novo total"""
+        self.file.seek(HEADER_SIZE + self.count * RECORD_SIZE)
+        self.file.write(np.ascontiguousarray(records, dtype=np.uint8).tobytes())
+        self.file.flush()
+        self.count += len(records)
+        self.write_header()
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+# Seção de índice (no fim do arquivo, em index_offset):
+#   nº de classes (u4) + reservado (u4)
+#   tabela de classes (dificuldade, pistas, início, total)
+#   ids dos registros (u4) agrupados por classe
+CLASS_DTYPE = np.dtype([
+    ("difficulty", "u1"), ("clues", "u1"), ("reserved", "<u2"),
+    ("start", "<u4"), ("count", "<u4")
+])
+
+
+def build_index(path, block=1 << 20):
+    """Gera (ou refaz) a seção de índice por dificuldade e nº de pistas"""
+    with open(path, "r+b") as f:
+        header = read_header(f)
+    count = header["count"]
+
+    # Lê só as colunas de dificuldade/pistas, um bloco por vez
+    records = np.memmap(path, dtype=np.uint8, mode="r", offset=HEADER_SIZE, shape=(count, RECORD_SIZE))
+    keys = np.empty(count, dtype=np.uint16)
+    for start in range(0, count, block):
+        part = np.asarray(records[start:start + block, :2], dtype=np.uint16)
+        keys[start:start + block] = (part[:, 0] << 8) | part[:, 1]
+    del records
+
+    ids = np.argsort(keys, kind="stable").astype(np.uint32)
+    classes, starts, counts = np.unique(keys[ids], return_index=True, return_counts=True)
+
+    table = np.zeros(len(classes), dtype=CLASS_DTYPE)
+    table["difficulty"] = classes >> 8
+    table["clues"] = classes & 0xFF
+    table["start"] = starts
+    table["count"] = counts
+
+    index_offset = HEADER_SIZE + count * RECORD_SIZE
+    with open(path, "r+b") as f:
+        f.truncate(index_offset)
+        f.seek(index_offset)
+        f.write(struct.pack("<II", len(table), 0))
+        f.write(table.tobytes())
+        f.write(ids.tobytes())
+        write_header(f, count, index_offset, header["seed"], header["per_difficulty"], header["chunk"],
+                     header["by_grade"])
+
+
+class PuzzleBank:
+    """
+    Banco de puzzles aberto via np.memmap: só o cabeçalho e a tabela de classes
+    são lidos; registros e ids são acessados sob demanda.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            header = read_header(f)
+            if not header["index_offset"]:
+                raise ValueError("Banco sem índice; rode build_index antes")
+            f.seek(header["index_offset"])
+            num_classes, _ = struct.unpack("<II", f.read(8))
+            self.classes = np.frombuffer(f.read(num_classes * CLASS_DTYPE.itemsize), dtype=CLASS_DTYPE)
+
+        self.count = header["count"]
+        self.records = np.memmap(path, dtype=np.uint8, mode="r", offset=HEADER_SIZE,
+                                 shape=(self.count, RECORD_SIZE))
+        self.ids = np.memmap(path, dtype="<u4", mode="r",
+                             offset=header["index_offset"] + 8 + self.classes.nbytes,
+                             shape=(self.count,))
+
+        # (dificuldade, pistas) -> (início, total) e dificuldade -> faixa contínua de ids
+        self.by_class = {}
+        self.by_difficulty = {}
+        for entry in self.classes:
+            name = DIFFICULTY_NAMES[entry["difficulty"]]
+            start, total = int(entry["start"]), int(entry["count"])
+            self.by_class[(name, int(entry["clues"]))] = (start, total)
+            first, end = self.by_difficulty.get(name, (start, start))
+            self.by_difficulty[name] = (min(first, start), max(end, start + total))
+
+    def clue_counts(self, difficulty):
+        """Números de pistas disponíveis para uma dificuldade"""
+        return sorted(clues for name, clues in self.by_class if name == difficulty)
+
+    def size(self, difficulty, clues=None):
+        """Quantos puzzles existem na classe pedida"""
+        if clues is None:
+            first, end = self.by_difficulty.get(difficulty, (0, 0))
+            return end - first
+        return self.by_class.get((difficulty, clues), (0, 0))[1]
+
+    def get(self, record_id):
+        """Lê e desempacota um único registro -> (board, solution, hidden)"""
+        boards, solutions, hidden = unpack_records(self.records[record_id])
+        return boards[0], solutions[0], hidden[0]
+
+    def pick(self, difficulty, clues=None, rng=None):
+        """Sorteia um puzzle da dificuldade (e opcionalmente do nº de pistas) em O(1)"""
+        rng = rng or np.random.default_rng()
+        if clues is None:
+            first, end = self.by_difficulty.get(difficulty, (0, 0))
+        else:
+            first, total = self.by_class.get((difficulty, clues), (0, 0))
+            end = first + total
+        if end <= first:
+            return None
+        return self.get(int(self.ids[rng.integers(first, end)]))
@@ -0,0 +1,130 @@
+import numpy as np
+from .game import DIFFICULTY_SETTINGS
+from .solver import FULL_MASK, POPCOUNT
+
+# Tabuleiro base válido; os demais saem de permutações que preservam as regras
+BASE_GRID = np.array(
+    [[(3 * (r % 3) + r // 3 + c) % 9 + 1 for c in range(9)] for r in range(9)],
+    dtype=np.int8
+)
+
+POPCOUNT_TABLE = np.array(POPCOUNT, dtype=np.int8)
+DIGIT_BITS = (1 << np.arange(1, 10)).astype(np.int16)
+
+
+def random_permutations(rng, n, size):
+    """Retorna n permutações aleatórias de range(size), shape (n, size)"""
+    return np.argsort(rng.random((n, size)), axis=1)
+
+
+def random_lines(rng, n):
+    """Ordem aleatória de linhas (ou colunas) que mantém as faixas 3x3 válidas"""
+    bands = random_permutations(rng, n, 3)
+    inside = np.argsort(rng.random((n, 3, 3)), axis=2)
+    return (bands[:, :, None] * 3 + inside).reshape(n, 9)
+
+
+def generate_solutions(n, rng):
+    """Gera n soluções completas de uma vez, shape (n, 9, 9)"""
+    rows = random_lines(rng, n)
+    cols = random_lines(rng, n)
+    digits = random_permutations(rng, n, 9).astype(np.int8) + 1
+
+    grids = BASE_GRID[rows[:, :, None], cols[:, None, :]]
+    grids = np.take_along_axis(digits, grids.reshape(n, 81).astype(np.intp) - 1, axis=1).reshape(n, 9, 9)
+
+    # Transpõe metade dos tabuleiros
+    transpose = rng.random(n) < 0.5
+    grids[transpose] = grids[transpose].transpose(0, 2, 1)
+    return grids
+
+
+def candidate_masks(boards):
+    """Máscaras de candidatos (bit d = dígito d) para cada célula, shape (n, 9, 9)"""
+    n = len(boards)
+    bits = np.where(boards > 0, np.left_shift(1, boards.astype(np.int16)), 0).astype(np.int16)
+    rows = np.bitwise_or.reduce(bits, axis=2)
+    cols = np.bitwise_or.reduce(bits, axis=1)
+    boxes = np.bitwise_or.reduce(bits.reshape(n, 3, 3, 3, 3), axis=(2, 4))
+    used = rows[:, :, None] | cols[:, None, :] | np.repeat(np.repeat(boxes, 3, axis=1), 3, axis=2)
+    return np.where(boards == 0, FULL_MASK & ~used, 0).astype(np.int16)
+
+
+def solve_singles(boards, solutions):
+    """
+    Aplica singles (naked e hidden) em todos os tabuleiros ao mesmo tempo.
+    Retorna um vetor bool com os tabuleiros resolvidos só com singles,
+    o que garante que a solução é única.
+    """
+    boards = boards.copy()
+    solved = np.zeros(len(boards), dtype=bool)
+
+    # Tabuleiros que ainda têm células vazias e continuam progredindo
+    work = np.arange(len(boards))
+    while len(work):
+        current = boards[work]
+        cand = candidate_masks(current)
+
+        # Naked single: apenas um candidato na célula
+        found = POPCOUNT_TABLE[cand] == 1
+
+        # Hidden single: dígito com uma única posição na linha, coluna ou bloco
+        planes = (cand[..., None] & DIGIT_BITS) != 0
+        in_row = planes.sum(axis=2, keepdims=True, dtype=np.int8) == 1
+        in_col = planes.sum(axis=1, keepdims=True, dtype=np.int8) == 1
+        box_planes = planes.reshape(len(work), 3, 3, 3, 3, 9)
+        in_box = box_planes.sum(axis=(2, 4), keepdims=True, dtype=np.int8) == 1
+        in_box = np.broadcast_to(in_box, box_planes.shape).reshape(planes.shape)
+        found |= (planes & (in_row | in_col | in_box)).any(axis=3)
+
+        # Deduções corretas só podem levar ao valor da solução
+        current[found] = solutions[work][found]
+        boards[work] = current
+
+        empty = (current == 0).any(axis=(1, 2))
+        solved[work[~empty]] = True
+        work = work[empty & found.any(axis=(1, 2))]
+
+    return solved
+
+
+def generate_batch(n, difficulty, seed=None):
+    """
+    Gera n puzzles de uma vez.
+    Retorna (boards, solutions, hidden): arrays (n, 9, 9) com os tabuleiros,
+    as soluções e a máscara das células escondidas.
+    """
+    rng = np.random.default_rng(seed)
+    target = DIFFICULTY_SETTINGS[difficulty]["hidden_cells"]
+
+    solutions = generate_solutions(n, rng)
+    boards = solutions.copy()
+    hidden = np.zeros((n, 9, 9), dtype=bool)
+    hidden_count = np.zeros(n, dtype=int)
+
+    # Cada tabuleiro tenta as 81 células numa ordem aleatória própria
+    order = random_permutations(rng, n, 81)
+    index = np.arange(n)
+
+    for step in range(81):
+        active = index[hidden_count < target]
+        if not len(active):
+            break
+
+        rows, cols = np.divmod(order[active, step], 9)
+        boards[active, rows, cols] = 0
+
+        # Mantém a remoção apenas onde o puzzle continua resolvível só com singles;
+        # se a célula removida já é um naked single, nem precisa propagar
+        cand = candidate_masks(boards[active])
+        unique = POPCOUNT_TABLE[cand[np.arange(len(active)), rows, cols]] == 1
+        check = ~unique
+        unique[check] = solve_singles(boards[active[check]], solutions[active[check]])
+        keep = active[unique]
+        undo = active[~unique]
+
+        hidden[keep, rows[unique], cols[unique]] = True
+        hidden_count[keep] += 1
+        boards[undo, rows[~unique], cols[~unique]] = solutions[undo, rows[~unique], cols[~unique]]
+
+    return boards, solutions, hidden
@@ -0,0 +1,123 @@
+import numpy as np
+from .geometry import geometry, board_order
+
+
+class CandidateGrid:
+    """
+    Candidatos de cada célula mantidos junto do tabuleiro do jogo.
+    Cada jogada ou remoção só recalcula os vizinhos da célula (20 no 9x9), e os
+    naked/hidden singles ficam em conjuntos prontos para as dicas.
+    """
+
+    def __init__(self, board):
+        self.geometry = g = geometry(board_order(board))
+        self.side = g.side
+        self.values = [int(v) for v in np.asarray(board).flatten()]
+
+        # Ocorrências de cada dígito por unidade (aceita repetições do jogador)
+        self.counts = [[0] * (g.side + 1) for _ in range(3 * g.side)]
+        # Quantas células vazias de cada unidade aceitam cada dígito
+        self.places = [[0] * (g.side + 1) for _ in range(3 * g.side)]
+        self.cand = [0] * g.cells
+
+        self.naked = set()   # células com um único candidato
+        self.hidden = set()  # (unidade, dígito) com um único lugar possível
+
+        for i, num in enumerate(self.values):
+            if num:
+                for u in g.cell_units[i]:
+                    self.counts[u][num] += 1
+        for i, num in enumerate(self.values):
+            if not num:
+                self.set_candidates(i, self.compute(i))
+
+    def compute(self, i):
+        """Máscara de candidatos da célula i a partir das contagens"""
+        mask = 0
+        r, c, b = self.geometry.cell_units[i]
+        rows, cols, boxes = self.counts[r], self.counts[c], self.counts[b]
+        for num in range(1, self.side + 1):
+            if not (rows[num] or cols[num] or boxes[num]):
+                mask |= 1 << num
+        return mask
+
+    def set_candidates(self, i, mask):
+        """Troca a máscara da célula i atualizando singles e posições"""
+        old = self.cand[i]
+        if old == mask:
+            return
+        self.cand[i] = mask
+        digits = self.geometry.digits
+
+        for u in self.geometry.cell_units[i]:
+            places = self.places[u]
+            for num in digits(old & ~mask):
+                places[num] -= 1
+                self.track_hidden(u, num)
+            for num in digits(mask & ~old):
+                places[num] += 1
+                self.track_hidden(u, num)
+
+        if self.geometry.popcount(mask) == 1:
+            self.naked.add(i)
+        else:
+            self.naked.discard(i)
+
+    def track_hidden(self, unit, num):
+        if self.places[unit][num] == 1:
+            self.hidden.add((unit, num))
+        else:
+            self.hidden.discard((unit, num))
+
+    def place(self, row, col, num):
+        """Atualiza o grid para um número colocado em (row, col)"""
+        i = row * self.side + col
+        if self.values[i]:
+            self.erase(row, col)
+
+        self.set_candidates(i, 0)
+        self.values[i] = num
+        for u in self.geometry.cell_units[i]:
+            self.counts[u][num] += 1
+        self.refresh_peers(i)
+
+    def erase(self, row, col):
+        """Atualiza o grid para a célula (row, col) apagada"""
+        i = row * self.side + col
+        num = self.values[i]
+        if not num:
+            return
+
+        self.values[i] = 0
+        for u in self.geometry.cell_units[i]:
+            self.counts[u][num] -= 1
+        self.refresh_peers(i)
+        self.set_candidates(i, self.compute(i))
+
+    def refresh_peers(self, i):
+        for p in self.geometry.peers[i]:
+            if not self.values[p]:
+                self.set_candidates(p, self.compute(p))
+
+    def candidates(self, row, col):
+        """Lista de candidatos da célula"""
+        return self.geometry.digits(self.cand[row * self.side + col])
+
+    def get_hint(self):
+        """
+        Retorna um naked ou hidden single como (row, col, num),
+        ou None se o tabuleiro não tiver nenhum
+        """
+        side = self.side
+        if self.naked:
+            i = next(iter(self.naked))
+            return (i // side, i % side, self.geometry.digits(self.cand[i])[0])
+
+        if self.hidden:
+            unit, num = next(iter(self.hidden))
+            bit = 1 << num
+            for i in self.geometry.units[unit]:
+                if self.cand[i] & bit:
+                    return (i // side, i % side, num)
+
+        return None
@@ -0,0 +1,224 @@
+import random
+import numpy as np
+from .geometry import board_order
+from .search import SteppedSearch, RUNNING, SOLVED, UNSOLVABLE
+
+
+class DancingLinks(SteppedSearch):
+    """
+    Resolve o Sudoku como problema de cobertura exata (Algorithm X)
+    usando Dancing Links, com a busca numa pilha explícita (veja SteppedSearch).
+
+    Colunas (restrições), com N = lado do tabuleiro (9 no 9x9):
+      célula (linha, coluna) preenchida, linha contém o dígito,
+      coluna contém o dígito e bloco contém o dígito -> 4 * N² colunas
+    Cada linha da matriz é um candidato (linha, coluna, dígito).
+    """
+
+    def __init__(self, board, randomize=False):
+        self.board = board
+        self.order = board_order(board)
+        self.side = self.order * self.order
+        self.nodes = 0  # Nós visitados na busca
+        self.solution = []
+        self.consistent = True
+
+        side = self.side
+        values = np.asarray(board)
+        used = set()
+
+        # Restrições já satisfeitas pelas células preenchidas
+        for r in range(side):
+            for c in range(side):
+                num = int(values[r][c])
+                if num:
+                    cols = self.constraints(r, c, num)
+                    if used.intersection(cols):
+                        self.consistent = False
+                    used.update(cols)
+
+        # Nó 0 é a raiz, 1..4N² são os cabeçalhos das colunas
+        headers = 4 * side * side
+        self.L = [0] * (headers + 1)
+        self.R = [0] * (headers + 1)
+        self.U = list(range(headers + 1))
+        self.D = list(range(headers + 1))
+        self.C = list(range(headers + 1))
+        self.S = [0] * (headers + 1)
+        self.row_of = [None] * (headers + 1)
+
+        # Liga apenas as colunas ainda não satisfeitas
+        prev = 0
+        for col in range(headers):
+            if col + 1 in used:
+                continue
+            self.R[prev] = col + 1
+            self.L[col + 1] = prev
+            prev = col + 1
+        self.R[prev] = 0
+        self.L[0] = prev
+
+        # Candidatos compatíveis com as células preenchidas
+        candidates = [
+            (r, c, num)
+            for r in range(side) for c in range(side) if not values[r][c]
+            for num in range(1, side + 1)
+            if not used.intersection(self.constraints(r, c, num))
+        ]
+        if randomize:
+            random.shuffle(candidates)
+
+        for candidate in candidates:
+            self.add_row(candidate)
+
+        self.reset()
+
+    def reset(self):
+        """Prepara a pilha da busca a partir do estado atual da matriz"""
+        # Cada quadro: [coluna coberta, nó (linha) atual, linha aplicada?]
+        self.stack = []
+        self.status = RUNNING if self.consistent else UNSOLVABLE
+        if self.consistent:
+            self.descend()
+
+    def constraints(self, row, col, num):
+        """Retorna os cabeçalhos das 4 restrições cobertas por um candidato"""
+        side, order = self.side, self.order
+        cells = side * side
+        box = (row // order) * order + col // order
+        return (
+            1 + row * side + col,
+            1 + cells + row * side + num - 1,
+            1 + 2 * cells + col * side + num - 1,
+            1 + 3 * cells + box * side + num - 1,
+        )
+
+    def add_row(self, candidate):
+        """Insere um candidato como linha da matriz esparsa"""
+        first = None
+        for col in self.constraints(*candidate):
+            node = len(self.C)
+            self.C.append(col)
+            self.row_of.append(candidate)
+
+            # Liga na vertical (no fim da coluna)
+            self.U.append(self.U[col])
+            self.D.append(col)
+            self.D[self.U[col]] = node
+            self.U[col] = node
+            self.S[col] += 1
+
+            # Liga na horizontal
+            if first is None:
+                first = node
+                self.L.append(node)
+                self.R.append(node)
+            else:
+                self.L.append(self.L[first])
+                self.R.append(first)
+                self.R[self.L[first]] = node
+                self.L[first] = node
+
+    def cover(self, col):
+        """Remove uma coluna e todas as linhas que a satisfazem"""
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        R[L[col]] = R[col]
+        L[R[col]] = L[col]
+        i = D[col]
+        while i != col:
+            j = R[i]
+            while j != i:
+                D[U[j]] = D[j]
+                U[D[j]] = U[j]
+                S[C[j]] -= 1
+                j = R[j]
+            i = D[i]
+
+    def uncover(self, col):
+        """Desfaz cover(col) na ordem inversa"""
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        i = U[col]
+        while i != col:
+            j = L[i]
+            while j != i:
+                S[C[j]] += 1
+                D[U[j]] = j
+                U[D[j]] = j
+                j = L[j]
+            i = U[i]
+        R[L[col]] = col
+        L[R[col]] = col
+
+    def choose_column(self):
+        """Escolhe a coluna com menos linhas (heurística S de Knuth)"""
+        best = None
+        size = self.side + 1
+        col = self.R[0]
+        while col:
+            if self.S[col] < size:
+                size = self.S[col]
+                best = col
+                if size <= 1:
+                    break
+            col = self.R[col]
+        return best
+
+    def solve(self, callback=None, max_nodes=None, max_time=None):
+        """
+        Busca uma cobertura exata e escreve a solução no tabuleiro
+        callback(row, col, num, is_backtrack)
+        True só se resolveu; com orçamento, use run() para saber se dá para retomar
+        """
+        return self.run(callback, max_nodes, max_time) == SOLVED
+
+    def descend(self):
+        """Cobre a próxima coluna (ou marca a solução encontrada)"""
+        if self.R[0] == 0:
+            self.status = SOLVED
+            return
+
+        col = self.choose_column()
+        self.cover(col)
+        self.stack.append([col, self.D[col], False])
+
+    def step(self):
+        """Aplica ou desfaz uma linha; None quando a busca termina"""
+        while self.status == RUNNING:
+            frame = self.stack[-1]
+            col, node, applied = frame
+
+            if applied:
+                # O ramo abaixo falhou: desfaz a linha e passa para a próxima
+                row, c, num = self.row_of[node]
+                self.solution.pop()
+                self.board[row][c] = 0
+                j = self.L[node]
+                while j != node:
+                    self.uncover(self.C[j])
+                    j = self.L[j]
+                frame[1] = self.D[node]
+                frame[2] = False
+                return (row, c, 0, True)
+
+            if node == col:
+                # Nenhuma linha restante satisfaz a coluna
+                self.uncover(col)
+                self.stack.pop()
+                if not self.stack:
+                    self.status = UNSOLVABLE
+                continue
+
+            self.nodes += 1
+            row, c, num = self.row_of[node]
+            j = self.R[node]
+            while j != node:
+                self.cover(self.C[j])
+                j = self.R[j]
+
+            self.board[row][c] = num
+            self.solution.append(self.row_of[node])
+            frame[2] = True
+            self.descend()
+            return (row, c, num, False)
+
+        return None
@@ -1,50 +1,235 @@
 import pygame
 import random
+import time
 import numpy as np
+from .solver import SudokuSolver, count_solutions
+from .grader import grade, solvable_with, TECHNIQUE_RANK
+from .candidates import CandidateGrid
+from .geometry import geometry
+
+# Orçamento (candidatos testados) para completar um tabuleiro 9x9; se estourar,
+# a geração recomeça com outros blocos diagonais em vez de travar
+SOLVE_NODE_BUDGET = 5000
+
+# Orçamento de cada teste de unicidade ao esconder uma célula; um teste que
+# estoura conta como "não única" e a célula fica visível. Limita a cauda da
+# geração (tabuleiros quase vazios podem exigir dezenas de ms por teste)
+UNIQUENESS_NODE_BUDGET = 500
+
+# Configurações por dificuldade, em células do tabuleiro 9x9
+# (em 16x16 e 25x25 as quantidades são escaladas pela área)
+# (min/max_technique e grade_hidden_cells são usados quando a geração mira a
+# nota, veja by_grade; grade_hidden_cells None = esconder o máximo possível)
+DIFFICULTY_SETTINGS = {
+    "fácil": {"hidden_cells": 40, "cells_per_section": 5, "grade_hidden_cells": 40,
+              "min_technique": "naked_single", "max_technique": "hidden_single"},
+    "médio": {"hidden_cells": 50, "cells_per_section": 6, "grade_hidden_cells": None,
+              "min_technique": "locked_candidates", "max_technique": "hidden_pair"},
+    "difícil": {"hidden_cells": 60, "cells_per_section": 7, "grade_hidden_cells": None,
+                "min_technique": "naked_pair", "max_technique": "x_wing"}
+}
+
+# Tentativas de gerar um puzzle com a nota pedida antes de aceitar o último
+# (SudokuGame.grade_met fica False nesse caso). Custo medido por tabuleiro com
+# by_grade: fácil ~6 ms; médio ~140 ms (máx. ~0,4 s); difícil ~440 ms (máx. ~1,4 s),
+# e ~5% dos difíceis esgotam as tentativas e ficam abaixo de naked_pair
+GRADE_ATTEMPTS = 20
 
 class SudokuGame:
-    def __init__(self, screen, difficulty):
+    def __init__(self, screen, difficulty, puzzle=None, bank=None, by_grade=False, order=3):
+        if by_grade and order != 3:
+            raise ValueError("A avaliação por técnicas só existe para 9x9")
+        
         self.screen = screen
         self.difficulty = difficulty
-        self.board = np.zeros((9, 9), dtype=int)
-        self.solution = np.zeros((9, 9), dtype=int)
+        self.by_grade = by_grade  # Mira a técnica exigida em vez do nº de células
+        
+        # Ordem do tabuleiro: 3 -> 9x9, 4 -> 16x16, 5 -> 25x25
+        self.order = order
+        self.side = order * order
+        self.geometry = geometry(order)
+        
+        self.board = np.zeros((self.side, self.side), dtype=int)
+        self.solution = np.zeros((self.side, self.side), dtype=int)
         self.hidden_cells = set()
+        self.difficulty_settings = DIFFICULTY_SETTINGS
+        
+        # Sorteia do banco pré-gerado (PuzzleBank), se houver
+        if puzzle is None and bank is not None:
+            puzzle = bank.pick(difficulty)
         
-        # Configurações por dificuldade
-        self.difficulty_settings = {
-            "fácil": {"hidden_cells": 40, "cells_per_section": 5},
-            "médio": {"hidden_cells": 50, "cells_per_section": 6},
-            "difícil": {"hidden_cells": 60, "cells_per_section": 7}
-        }
+        # Usa um puzzle pronto (board, solution, hidden) se fornecido
+        if puzzle is not None:
+            self.load_puzzle(*puzzle)
+        else:
+            self.generate_puzzle()
+        
+        self.rebuild_state()
+    
+    def rebuild_state(self):
+        """Recria o estado incremental depois de mudanças diretas em self.board"""
+        # Candidatos e contagem de ocorrências por linha/coluna/bloco
+        self.candidates = CandidateGrid(self.board)
+        
+        # Células com número repetido na unidade e células editáveis erradas
+        self.conflicts = set()
+        self.wrong_cells = set()
+        for row in range(self.side):
+            for col in range(self.side):
+                self.update_cell_state(row, col)
+    
+    def is_conflict(self, row, col):
+        """True se o número da célula aparece mais de uma vez numa unidade"""
+        i = row * self.side + col
+        num = self.candidates.values[i]
+        counts = self.candidates.counts
+        return bool(num) and any(counts[u][num] > 1 for u in self.geometry.cell_units[i])
+    
+    def update_cell_state(self, row, col):
+        """Atualiza conflito e erro de uma única célula"""
+        if self.is_conflict(row, col):
+            self.conflicts.add((row, col))
+        else:
+            self.conflicts.discard((row, col))
+        
+        num = self.board[row][col]
+        if num and (row, col) in self.hidden_cells and num != self.solution[row][col]:
+            self.wrong_cells.add((row, col))
+        else:
+            self.wrong_cells.discard((row, col))
+    
+    def update_conflicts(self, row, col, num):
+        """Reavalia as células das unidades de (row, col) que têm `num`"""
+        values = self.candidates.values
+        for u in self.geometry.cell_units[row * self.side + col]:
+            for i in self.geometry.units[u]:
+                if values[i] == num:
+                    self.update_cell_state(i // self.side, i % self.side)
+    
+    def place(self, row, col, num):
+        """Coloca um número no tabuleiro mantendo o estado incremental"""
+        old = self.board[row][col]
+        self.board[row][col] = num
+        self.candidates.place(row, col, num)
         
-        self.generate_puzzle()
+        if old:
+            self.update_conflicts(row, col, old)
+        self.update_conflicts(row, col, num)
+        self.update_cell_state(row, col)
+    
+    def erase(self, row, col):
+        """Apaga uma célula mantendo o estado incremental"""
+        old = self.board[row][col]
+        self.board[row][col] = 0
+        self.candidates.erase(row, col)
+        
+        if old:
+            self.update_conflicts(row, col, old)
+        self.update_cell_state(row, col)
+    
+    def get_hint(self):
+        """
+        Dica (row, col, num) para uma célula vazia, sem copiar o tabuleiro.
+        Usa um naked/hidden single do grid de candidatos; se o jogador deixou
+        números errados e o single não bate com a solução, usa a solução.
+        """
+        hint = self.candidates.get_hint()
+        if hint:
+            row, col, _ = hint
+            return (row, col, int(self.solution[row][col]))
+        
+        for row, col in self.hidden_cells:
+            if self.board[row][col] == 0:
+                return (row, col, int(self.solution[row][col]))
+        return None
+    
+    def load_puzzle(self, board, solution, hidden):
+        """Carrega um puzzle já gerado (ex.: saída de generate_batch)"""
+        self.board = np.array(board, dtype=int)
+        self.solution = np.array(solution, dtype=int)
+        self.hidden_cells = {(int(r), int(c)) for r, c in zip(*np.nonzero(hidden))}
+        self.generation_time = 0.0
+        self.grade = grade(self.board) if self.order == 3 else None
+        self.grade_met = None
+    
+    def restore_board(self, board):
+        """Recoloca as jogadas de uma partida salva sobre o puzzle carregado"""
+        self.board = np.array(board, dtype=int)
+        self.rebuild_state()
     
     def generate_puzzle(self):
         """Gera um tabuleiro de Sudoku válido"""
-        # Preenche a diagonal de blocos 3x3
-        self.fill_diagonal_boxes()
-        
-        # Resolve o resto do tabuleiro
-        self.solve_sudoku()
-        self.solution = self.board.copy()
+        start = time.perf_counter()
+        settings = self.difficulty_settings[self.difficulty]
         
-        # Remove células para criar o puzzle
-        self.remove_cells()
+        self.grade_met = None  # Só avaliado quando a geração mira a nota
+        for _ in range(GRADE_ATTEMPTS if self.by_grade else 1):
+            self.board = np.zeros((self.side, self.side), dtype=int)
+            self.hidden_cells = set()
+            
+            if self.order == 3:
+                # Preenche a diagonal de blocos 3x3 e resolve o resto do tabuleiro
+                self.fill_diagonal_boxes()
+                while not self.solve_sudoku(backend="dlx", max_nodes=SOLVE_NODE_BUDGET):
+                    self.fill_diagonal_boxes()
+            else:
+                # Em 16x16 e 25x25 a busca pode demorar demais; parte de um padrão válido
+                self.fill_pattern()
+            self.solution = self.board.copy()
+            
+            # Remove células para criar o puzzle
+            self.remove_cells()
+            
+            if self.order != 3:
+                self.grade = None
+                break
+            
+            # Nota (score, técnica mais difícil) de todo puzzle gerado
+            self.grade = grade(self.board)
+            if not self.by_grade:
+                break
+            self.grade_met = TECHNIQUE_RANK[self.grade[1]] >= TECHNIQUE_RANK[settings["min_technique"]]
+            if self.grade_met:
+                break
+
+        self.generation_time = (time.perf_counter() - start) * 1000
     
     def fill_diagonal_boxes(self):
-        """Preenche os blocos diagonais 3x3 com números válidos"""
-        for box in range(0, 9, 3):
+        """Preenche os blocos diagonais com números válidos"""
+        for box in range(0, self.side, self.order):
             self.fill_box(box, box)
     
     def fill_box(self, row, col):
-        """Preenche um bloco 3x3 com números válidos"""
-        nums = random.sample(range(1, 10), 9)
+        """Preenche um bloco com números válidos"""
+        nums = random.sample(range(1, self.side + 1), self.side)
         index = 0
-        for i in range(3):
-            for j in range(3):
+        for i in range(self.order):
+            for j in range(self.order):
                 self.board[row+i][col+j] = nums[index]
                 index += 1
     
+    def fill_pattern(self):
+        """
+        Preenche o tabuleiro a partir de um padrão válido embaralhado:
+        troca dígitos, linhas dentro das faixas, faixas, colunas e pilhas
+        """
+        n, side = self.order, self.side
+        
+        def shuffled_lines():
+            bands = random.sample(range(n), n)
+            return [band * n + line for band in bands for line in random.sample(range(n), n)]
+        
+        rows = shuffled_lines()
+        cols = shuffled_lines()
+        digits = random.sample(range(1, side + 1), side)
+        for r in range(side):
+            for c in range(side):
+                base = (n * (rows[r] % n) + rows[r] // n + cols[c]) % side
+                self.board[r][c] = digits[base]
+        
+        if random.random() < 0.5:
+            self.board = self.board.T.copy()
+    
     def is_valid(self, num, pos):
         """Verifica se um número é válido em uma posição"""
         # Verifica linha
@@ -55,12 +240,13 @@ class SudokuGame:
         if num in self.board[:, pos[1]]:
             return False
         
-        # Verifica bloco 3x3
-        box_x = pos[1] // 3
-        box_y = pos[0] // 3
+        # Verifica bloco
+        n = self.order
+        box_x = pos[1] // n
+        box_y = pos[0] // n
         
-        for i in range(box_y*3, box_y*3 + 3):
-            for j in range(box_x*3, box_x*3 + 3):
+        for i in range(box_y*n, box_y*n + n):
+            for j in range(box_x*n, box_x*n + n):
                 if self.board[i][j] == num:
                     return False
         
@@ -68,59 +254,130 @@ class SudokuGame:
     
     def find_empty(self):
         """Encontra a próxima célula vazia"""
-        for i in range(9):
-            for j in range(9):
+        for i in range(self.side):
+            for j in range(self.side):
                 if self.board[i][j] == 0:
                     return (i, j)
         return None
     
-    def solve_sudoku(self):
-        """Resolve o Sudoku usando backtracking"""
-        empty = self.find_empty()
-        if not empty:
+    def solve_sudoku(self, backend="backtracking", max_nodes=None, max_time=None):
+        """
+        Resolve o Sudoku usando backtracking ou Dancing Links (busca iterativa)
+        Retorna False se não houver solução ou se o orçamento acabar
+        """
+        givens = self.board.copy()
+        solver = SudokuSolver(self.board, backend)
+        if solver.solve_visually(max_nodes=max_nodes, max_time=max_time):
             return True
         
-        row, col = empty
-        
-        for num in random.sample(range(1, 10), 9):
-            if self.is_valid(num, (row, col)):
-                self.board[row][col] = num
-                
-                if self.solve_sudoku():
-                    return True
-                
-                self.board[row][col] = 0
-        
+        # Busca interrompida pelo orçamento: descarta o preenchimento parcial
+        self.board[:] = givens
         return False
     
     def remove_cells(self):
-        """Remove células baseado na dificuldade"""
+        """Remove células baseado na dificuldade mantendo a solução única"""
         settings = self.difficulty_settings[self.difficulty]
+        n, side = self.order, self.side
         hidden = 0
         
-        # Garante que cada seção tenha no mínimo X células escondidas
-        sections = [(i, j) for i in range(0, 9, 3) for j in range(0, 9, 3)]
+        # Quantidades do 9x9 escaladas para o tamanho do tabuleiro
+        target = round(settings["hidden_cells"] * side * side / 81)
+        per_section = round(settings["cells_per_section"] * side / 9)
+        
+        # Mirando a nota, o limite vem de grade_hidden_cells: o fácil continua com
+        # 40 células, médio e difícil escondem o máximo que max_technique permitir
+        if self.by_grade:
+            target = settings["grade_hidden_cells"] or side * side
+        
+        # Primeiro tenta X células de cada seção, depois o resto em ordem aleatória
+        sections = [(i, j) for i in range(0, side, n) for j in range(0, side, n)]
+        order = []
         for section in sections:
-            cells = [(section[0]+i, section[1]+j) for i in range(3) for j in range(3)]
-            to_hide = random.sample(cells, settings["cells_per_section"])
-            
-            for cell in to_hide:
-                if hidden >= settings["hidden_cells"]:
-                    break
-                self.hidden_cells.add(cell)
-                self.board[cell[0]][cell[1]] = 0
+            cells = [(section[0]+i, section[1]+j) for i in range(n) for j in range(n)]
+            order += random.sample(cells, per_section)
+        chosen = set(order)
+        rest = [(i, j) for i in range(side) for j in range(side) if (i, j) not in chosen]
+        random.shuffle(rest)
+        order += rest
+        
+        if self.order != 3:
+            self.remove_deducible_cells(order, target)
+            return
+
+        for row, col in order:
+            if hidden >= target:
+                break
+
+            num = self.board[row][col]
+            self.board[row][col] = 0
+
+            # Só esconde a célula se o puzzle continuar com solução única
+            # (se o número é o único candidato da célula, a unicidade se mantém).
+            # Mirando a nota, exige também que continue resolvível só com técnicas
+            # até max_technique (o que já garante unicidade)
+            forced = not any(self.is_valid(n, (row, col)) for n in range(1, 10) if n != num)
+            if forced:
+                keep = True
+            elif self.by_grade:
+                keep = solvable_with(self.board, settings["max_technique"])
+            else:
+                keep = count_solutions(self.board, limit=2, max_nodes=UNIQUENESS_NODE_BUDGET) == 1
+            if keep:
+                self.hidden_cells.add((row, col))
                 hidden += 1
+            else:
+                self.board[row][col] = num
+    
+    def remove_deducible_cells(self, order, target):
+        """
+        Remoção para 16x16 e 25x25: só esconde uma célula se ela puder ser
+        deduzida de volta num passo (naked ou hidden single). Assim o puzzle
+        continua com solução única sem rodar a contagem de soluções, que não
+        escala nesses tamanhos.
+        """
+        g = self.geometry
+        values = [int(v) for v in self.board.flatten()]
+        rows, cols, boxes = [0] * g.side, [0] * g.side, [0] * g.side
+        for i, num in enumerate(values):
+            rows[g.cell_row[i]] |= 1 << num
+            cols[g.cell_col[i]] |= 1 << num
+            boxes[g.cell_box[i]] |= 1 << num
         
-        # Completa o resto aleatoriamente
-        while hidden < settings["hidden_cells"]:
-            row = random.randint(0, 8)
-            col = random.randint(0, 8)
+        def candidates(i):
+            return g.full_mask & ~(rows[g.cell_row[i]] | cols[g.cell_col[i]] | boxes[g.cell_box[i]])
+        
+        hidden = 0
+        for row, col in order:
+            if hidden >= target:
+                break
             
-            if (row, col) not in self.hidden_cells and self.board[row][col] != 0:
-                self.hidden_cells.add((row, col))
+            i = row * g.side + col
+            num = values[i]
+            bit = 1 << num
+            values[i] = 0
+            rows[g.cell_row[i]] &= ~bit
+            cols[g.cell_col[i]] &= ~bit
+            boxes[g.cell_box[i]] &= ~bit
+            
+            # Naked single: só `num` cabe na célula
+            forced = g.popcount(candidates(i)) == 1
+            # Hidden single: `num` não cabe em outra célula vazia de uma unidade
+            if not forced:
+                for u in g.cell_units[i]:
+                    if not any(j != i and not values[j] and candidates(j) & bit for j in g.units[u]):
+                        forced = True
+                        break
+            
+            if forced:
                 self.board[row][col] = 0
+                self.hidden_cells.add((row, col))
                 hidden += 1
-    
+            else:
+                values[i] = num
+                rows[g.cell_row[i]] |= bit
+                cols[g.cell_col[i]] |= bit
+                boxes[g.cell_box[i]] |= bit
+
     def is_valid_placement(self, num, pos):
         """Verifica se um número é válido em uma posição"""
         row, col = pos
@@ -129,16 +386,9 @@ class SudokuGame:
         if (row, col) not in self.hidden_cells:
             return False
             
-        # Verifica linha e coluna
-        if num in self.board[row, :] or num in self.board[:, col]:
-            return False
-            
-        # Verifica bloco 3x3
-        box_x, box_y = col // 3, row // 3
-        if num in self.board[box_y*3:(box_y+1)*3, box_x*3:(box_x+1)*3]:
-            return False
-            
-        return True
+        # Verifica linha, coluna e bloco pelas contagens de ocorrências
+        counts = self.candidates.counts
+        return not any(counts[u][num] for u in self.geometry.cell_units[row * self.side + col])
     
     def run(self):
         """Loop principal do jogo"""
@@ -0,0 +1,83 @@
+from functools import lru_cache
+import math
+
+# Ordens suportadas: 3 -> 9x9, 4 -> 16x16, 5 -> 25x25
+ORDERS = (3, 4, 5)
+
+
+def mask_digits(mask):
+    """Dígitos presentes numa máscara (bit d = dígito d), em ordem crescente"""
+    digits = []
+    while mask:
+        low = mask & -mask
+        digits.append(low.bit_length() - 1)
+        mask ^= low
+    return digits
+
+
+def popcount(mask):
+    return bin(mask).count("1")
+
+
+class Geometry:
+    """
+    Tabelas de um tabuleiro de ordem n (lado n², blocos n x n).
+    Os candidatos são inteiros Python com um bit por dígito (1..n²), então
+    a mesma representação serve para 9, 16 ou 25 dígitos.
+    """
+
+    def __init__(self, order):
+        side = order * order
+        self.order = order
+        self.side = side
+        self.cells = side * side
+        self.full_mask = ((1 << side) - 1) << 1
+
+        self.cell_row = [i // side for i in range(self.cells)]
+        self.cell_col = [i % side for i in range(self.cells)]
+        self.cell_box = [(i // side // order) * order + (i % side) // order for i in range(self.cells)]
+
+        rows = [[r * side + c for c in range(side)] for r in range(side)]
+        cols = [[r * side + c for r in range(side)] for c in range(side)]
+        boxes = [[] for _ in range(side)]
+        for i in range(self.cells):
+            boxes[self.cell_box[i]].append(i)
+        self.rows, self.cols, self.boxes = rows, cols, boxes
+        self.units = rows + cols + boxes
+
+        # Unidades de cada célula: linha (0..n²-1), coluna (n²..) e bloco (2n²..)
+        self.cell_units = [
+            (self.cell_row[i], side + self.cell_col[i], 2 * side + self.cell_box[i])
+            for i in range(self.cells)
+        ]
+        self.peers = [
+            sorted(set(rows[self.cell_row[i]] + cols[self.cell_col[i]] + boxes[self.cell_box[i]]) - {i})
+            for i in range(self.cells)
+        ]
+
+        # Para 9x9 as tabelas cabem na memória e evitam chamadas de função
+        if order <= 3:
+            table = [popcount(m) for m in range(self.full_mask + 1)]
+            digits = [mask_digits(m) for m in range(self.full_mask + 1)]
+            self.popcount = table.__getitem__
+            self.digits = digits.__getitem__
+        else:
+            self.popcount = popcount
+            self.digits = mask_digits
+
+
+@lru_cache(maxsize=None)
+def geometry(order=3):
+    """Geometria (em cache) do tabuleiro de ordem `order`"""
+    if order not in ORDERS:
+        raise ValueError(f"Ordem de tabuleiro não suportada: {order}")
+    return Geometry(order)
+
+
+def board_order(board):
+    """Ordem do tabuleiro a partir do lado (9 -> 3, 16 -> 4, 25 -> 5)"""
+    side = len(board)
+    order = math.isqrt(side)
+    if order * order != side:
+        raise ValueError(f"Lado de tabuleiro inválido: {side}")
+    return order
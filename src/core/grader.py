@@ -0,0 +1,264 @@
+from itertools import combinations
+import numpy as np
+from .solver import FULL_MASK, POPCOUNT, MASK_DIGITS, CELL_BOX, PEERS
+
+# Escada de técnicas, da mais simples para a mais difícil, com o peso de cada uso
+TECHNIQUES = [
+    ("naked_single", 1),
+    ("hidden_single", 2),
+    ("locked_candidates", 4),
+    ("naked_pair", 6),
+    ("hidden_pair", 8),
+    ("naked_triple", 10),
+    ("hidden_triple", 12),
+    ("x_wing", 15),
+]
+# Quando a escada não basta, o puzzle exige tentativa e erro
+BACKTRACKING = "backtracking"
+BACKTRACKING_SCORE = 50
+
+TECHNIQUE_RANK = {name: rank for rank, (name, _) in enumerate(TECHNIQUES, 1)}
+TECHNIQUE_RANK[BACKTRACKING] = len(TECHNIQUES) + 1
+
+ROWS = [[r * 9 + c for c in range(9)] for r in range(9)]
+COLS = [[r * 9 + c for r in range(9)] for c in range(9)]
+BOXES = [[(b // 3 * 3 + k // 3) * 9 + b % 3 * 3 + k % 3 for k in range(9)] for b in range(9)]
+UNITS = ROWS + COLS + BOXES
+
+
+class Grader:
+    """
+    Resolve o puzzle só com técnicas humanas sobre candidatos em máscaras de bits,
+    sempre aplicando a técnica mais simples que ainda faz progresso.
+    """
+
+    def __init__(self, board, max_technique=None):
+        self.values = [int(v) for v in np.asarray(board).flatten()]
+        self.cand = [0] * 81
+        self.max_rank = TECHNIQUE_RANK[max_technique] if max_technique else len(TECHNIQUES)
+        self.contradiction = False
+
+        rows = [0] * 9
+        cols = [0] * 9
+        boxes = [0] * 9
+        for i, num in enumerate(self.values):
+            if num:
+                bit = 1 << num
+                if (rows[i // 9] | cols[i % 9] | boxes[CELL_BOX[i]]) & bit:
+                    self.contradiction = True
+                rows[i // 9] |= bit
+                cols[i % 9] |= bit
+                boxes[CELL_BOX[i]] |= bit
+        for i, num in enumerate(self.values):
+            if not num:
+                self.cand[i] = FULL_MASK & ~(rows[i // 9] | cols[i % 9] | boxes[CELL_BOX[i]])
+                if not self.cand[i]:
+                    self.contradiction = True
+
+        self.steps = [
+            self.naked_single, self.hidden_single, self.locked_candidates,
+            self.naked_pair, self.hidden_pair, self.naked_triple,
+            self.hidden_triple, self.x_wing
+        ][:self.max_rank]
+
+    def place(self, i, num):
+        """Coloca um dígito e o elimina dos vizinhos"""
+        self.values[i] = num
+        self.cand[i] = 0
+        keep = ~(1 << num)
+        cand = self.cand
+        for p in PEERS[i]:
+            if cand[p]:
+                cand[p] &= keep
+                if not cand[p]:
+                    self.contradiction = True
+
+    def eliminate(self, cells, mask):
+        """Remove `mask` dos candidatos das células; True se algo mudou"""
+        cand = self.cand
+        changed = False
+        for i in cells:
+            if cand[i] & mask:
+                cand[i] &= ~mask
+                changed = True
+                if not cand[i]:
+                    self.contradiction = True
+        return changed
+
+    # --- Técnicas -----------------------------------------------------------
+
+    # Cada técnica devolve quantas vezes foi aplicada (0 se não fez progresso);
+    # os singles aplicam numa só varredura tudo o que encontram
+
+    def naked_single(self):
+        cand = self.cand
+        found = 0
+        for i in range(81):
+            if cand[i] and POPCOUNT[cand[i]] == 1:
+                self.place(i, MASK_DIGITS[cand[i]][0])
+                found += 1
+        return found
+
+    def hidden_single(self):
+        cand = self.cand
+        found = 0
+        for unit in UNITS:
+            once = 0
+            twice = 0
+            for i in unit:
+                twice |= once & cand[i]
+                once |= cand[i]
+            once &= ~twice
+            for num in MASK_DIGITS[once]:
+                bit = 1 << num
+                for i in unit:
+                    if cand[i] & bit:
+                        self.place(i, num)
+                        found += 1
+                        break
+        return found
+
+    def locked_candidates(self):
+        cand = self.cand
+        for b, box in enumerate(BOXES):
+            for num in MASK_DIGITS[FULL_MASK]:
+                bit = 1 << num
+                cells = [i for i in box if cand[i] & bit]
+                if len(cells) < 2:
+                    continue
+                # Pointing: o dígito do bloco está todo numa linha/coluna
+                row = cells[0] // 9
+                if all(i // 9 == row for i in cells):
+                    if self.eliminate([i for i in ROWS[row] if CELL_BOX[i] != b], bit):
+                        return True
+                col = cells[0] % 9
+                if all(i % 9 == col for i in cells):
+                    if self.eliminate([i for i in COLS[col] if CELL_BOX[i] != b], bit):
+                        return True
+
+        # Claiming: o dígito da linha/coluna está todo num bloco
+        for unit in ROWS + COLS:
+            for num in MASK_DIGITS[FULL_MASK]:
+                bit = 1 << num
+                cells = [i for i in unit if cand[i] & bit]
+                if len(cells) < 2:
+                    continue
+                b = CELL_BOX[cells[0]]
+                if all(CELL_BOX[i] == b for i in cells):
+                    if self.eliminate([i for i in BOXES[b] if i not in unit], bit):
+                        return True
+        return False
+
+    def naked_subset(self, size):
+        """Pares/triplas nus: `size` células de uma unidade com `size` candidatos"""
+        cand = self.cand
+        for unit in UNITS:
+            cells = [i for i in unit if cand[i] and POPCOUNT[cand[i]] <= size]
+            if len(cells) < size:
+                continue
+            for group in combinations(cells, size):
+                mask = 0
+                for i in group:
+                    mask |= cand[i]
+                if POPCOUNT[mask] == size:
+                    others = [i for i in unit if cand[i] and i not in group]
+                    if self.eliminate(others, mask):
+                        return True
+        return False
+
+    def hidden_subset(self, size):
+        """Pares/triplas ocultos: `size` dígitos presos a `size` células da unidade"""
+        cand = self.cand
+        for unit in UNITS:
+            # Posições (máscara de índices na unidade) de cada dígito ainda livre
+            places = {}
+            for k, i in enumerate(unit):
+                for num in MASK_DIGITS[cand[i]]:
+                    places[num] = places.get(num, 0) | (1 << k)
+            digits = [num for num, pos in places.items() if POPCOUNT[pos << 1] <= size]
+            if len(digits) < size:
+                continue
+            for group in combinations(digits, size):
+                pos = 0
+                mask = 0
+                for num in group:
+                    pos |= places[num]
+                    mask |= 1 << num
+                if POPCOUNT[pos << 1] == size:
+                    cells = [unit[k] for k in range(9) if pos & (1 << k)]
+                    if self.eliminate(cells, FULL_MASK & ~mask):
+                        return True
+        return False
+
+    def naked_pair(self):
+        return self.naked_subset(2)
+
+    def naked_triple(self):
+        return self.naked_subset(3)
+
+    def hidden_pair(self):
+        return self.hidden_subset(2)
+
+    def hidden_triple(self):
+        return self.hidden_subset(3)
+
+    def x_wing(self):
+        cand = self.cand
+        for lines, cross in ((ROWS, COLS), (COLS, ROWS)):
+            for num in MASK_DIGITS[FULL_MASK]:
+                bit = 1 << num
+                # Linhas em que o dígito aparece em exatamente duas posições
+                pairs = {}
+                for n, line in enumerate(lines):
+                    pos = [k for k, i in enumerate(line) if cand[i] & bit]
+                    if len(pos) == 2:
+                        pairs.setdefault(tuple(pos), []).append(n)
+                for (a, b), found in pairs.items():
+                    if len(found) < 2:
+                        continue
+                    for first, second in combinations(found, 2):
+                        others = [i for k in (a, b) for n, i in enumerate(cross[k])
+                                  if n not in (first, second)]
+                        if self.eliminate(others, bit):
+                            return True
+        return False
+
+    # --- Avaliação ----------------------------------------------------------
+
+    def solve(self):
+        """
+        Aplica a escada até resolver ou travar.
+        Retorna (score, técnica mais difícil usada, resolvido)
+        """
+        score = 0
+        hardest = 0
+        while not self.contradiction and any(self.cand):
+            for rank, step in enumerate(self.steps, 1):
+                applied = step()
+                if applied:
+                    score += TECHNIQUES[rank - 1][1] * applied
+                    hardest = max(hardest, rank)
+                    break
+            else:
+                break
+
+        solved = not self.contradiction and all(self.values)
+        name = TECHNIQUES[hardest - 1][0] if hardest else None
+        return score, name, solved
+
+
+def grade(board):
+    """
+    Avalia a dificuldade do puzzle.
+    Retorna (score, técnica mais difícil); se a escada não resolve,
+    a técnica é "backtracking".
+    """
+    score, hardest, solved = Grader(board).solve()
+    if not solved:
+        return score + BACKTRACKING_SCORE, BACKTRACKING
+    return score, hardest
+
+
+def solvable_with(board, max_technique):
+    """True se o puzzle se resolve usando apenas técnicas até `max_technique`"""
+    return Grader(board, max_technique).solve()[2]
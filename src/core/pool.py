@@ -0,0 +1,101 @@
+import threading
+from collections import deque
+from .batch import generate_batch
+from .game import DIFFICULTY_SETTINGS
+
+
+class PuzzlePool:
+    """
+    Mantém puzzles prontos por dificuldade, gerados por uma thread em segundo plano.
+    take() devolve (board, solution, hidden) na hora ou None se o pool estiver vazio.
+    """
+
+    def __init__(self, size=5, low_watermark=2, difficulties=None):
+        self.size = size
+        self.low_watermark = low_watermark
+        self.difficulties = list(difficulties or DIFFICULTY_SETTINGS)
+        self.puzzles = {d: deque() for d in self.difficulties}
+
+        # Contadores de acertos e faltas do pool
+        self.hits = {d: 0 for d in self.difficulties}
+        self.misses = {d: 0 for d in self.difficulties}
+
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        """Inicia a thread que enche o pool"""
+        if self.running:
+            return
+        self.running = True
+        self.wakeup.set()
+        self.thread = threading.Thread(target=self.worker, name="puzzle-pool", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Para a thread de geração"""
+        self.running = False
+        self.wakeup.set()
+        if self.thread:
+            self.thread.join()
+            self.thread = None
+
+    def take(self, difficulty):
+        """Retira um puzzle pronto e pede reposição se ficou abaixo da marca"""
+        with self.lock:
+            queue = self.puzzles[difficulty]
+            puzzle = queue.popleft() if queue else None
+            if puzzle is None:
+                self.misses[difficulty] += 1
+            else:
+                self.hits[difficulty] += 1
+            low = len(queue) <= self.low_watermark
+
+        if low:
+            self.wakeup.set()
+        return puzzle
+
+    def available(self, difficulty):
+        """Quantos puzzles prontos existem para a dificuldade"""
+        with self.lock:
+            return len(self.puzzles[difficulty])
+
+    def stats(self):
+        """Acertos, faltas e taxa de acerto por dificuldade"""
+        result = {}
+        with self.lock:
+            for d in self.difficulties:
+                total = self.hits[d] + self.misses[d]
+                result[d] = {
+                    "ready": len(self.puzzles[d]),
+                    "hits": self.hits[d],
+                    "misses": self.misses[d],
+                    "hit_rate": self.hits[d] / total if total else 0.0
+                }
+        return result
+
+    def refill(self):
+        """Completa as dificuldades que estão na marca mínima ou abaixo dela"""
+        for d in self.difficulties:
+            with self.lock:
+                missing = self.size - len(self.puzzles[d])
+                if len(self.puzzles[d]) > self.low_watermark:
+                    missing = 0
+            if missing <= 0 or not self.running:
+                continue
+
+            boards, solutions, hidden = generate_batch(missing, d)
+            with self.lock:
+                for puzzle in zip(boards, solutions, hidden):
+                    if len(self.puzzles[d]) < self.size:
+                        self.puzzles[d].append(puzzle)
+
+    def worker(self):
+        """Espera pedidos de reposição e gera os puzzles que faltam"""
+        while self.running:
+            self.wakeup.wait()
+            self.wakeup.clear()
+            if self.running:
+                self.refill()
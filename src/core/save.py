@@ -0,0 +1,182 @@
+import os
+import struct
+import threading
+import zlib
+import numpy as np
+from .game import DIFFICULTY_SETTINGS
+
+# Formato da partida salva (registro único de tamanho fixo para cada ordem):
+#   cabeçalho de 20 bytes: magic, versão, ordem, dificuldade, vidas, dicas,
+#                          tempo de jogo (ms) e CRC32 do resto do registro
+#   tabuleiro atual e solução: dois dígitos por byte até 9x9, um byte por
+#   célula nos tabuleiros maiores (o 16 não cabe em 4 bits)
+#   máscara das células escondidas: 1 bit por célula
+# Um 9x9 ocupa 20 + 41 + 41 + 11 = 113 bytes.
+MAGIC = b"SDKS"
+VERSION = 1
+HEADER = struct.Struct("<4sBBBBBxxxII")
+
+DIFFICULTY_IDS = {name: i for i, name in enumerate(DIFFICULTY_SETTINGS)}
+DIFFICULTY_NAMES = list(DIFFICULTY_SETTINGS)
+
+
+def digits_size(order):
+    cells = order ** 4
+    return (cells + 1) // 2 if order <= 3 else cells
+
+
+def record_size(order):
+    return HEADER.size + 2 * digits_size(order) + (order ** 4 + 7) // 8
+
+
+def pack_board(board, order):
+    flat = np.asarray(board, dtype=np.uint8).ravel()
+    if order > 3:
+        return flat.tobytes()
+    padded = np.zeros(len(flat) + len(flat) % 2, dtype=np.uint8)
+    padded[:len(flat)] = flat
+    return ((padded[0::2] << 4) | padded[1::2]).tobytes()
+
+
+def unpack_board(data, order):
+    side = order * order
+    packed = np.frombuffer(data, dtype=np.uint8)
+    if order > 3:
+        return packed.reshape(side, side).astype(int)
+    flat = np.empty(len(packed) * 2, dtype=np.uint8)
+    flat[0::2] = packed >> 4
+    flat[1::2] = packed & 0x0F
+    return flat[:side * side].reshape(side, side).astype(int)
+
+
+def pack_save(game, lives, hints_left, elapsed_ms):
+    """Estado da partida -> registro binário (bytes)"""
+    hidden = np.zeros((game.side, game.side), dtype=bool)
+    if game.hidden_cells:
+        rows, cols = zip(*game.hidden_cells)
+        hidden[list(rows), list(cols)] = True
+
+    payload = (pack_board(game.board, game.order) + pack_board(game.solution, game.order)
+               + np.packbits(hidden.ravel()).tobytes())
+    header = HEADER.pack(MAGIC, VERSION, game.order, DIFFICULTY_IDS[game.difficulty],
+                         max(lives, 0), hints_left, int(elapsed_ms), zlib.crc32(payload))
+    return header + payload
+
+
+def unpack_save(data):
+    """Registro binário -> dict com o estado da partida; ValueError se inválido"""
+    if len(data) < HEADER.size:
+        raise ValueError("Partida salva truncada")
+    magic, version, order, difficulty, lives, hints_left, elapsed_ms, crc = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION or order not in (3, 4, 5):
+        raise ValueError("Arquivo não é uma partida salva compatível")
+    if len(data) != record_size(order) or zlib.crc32(data[HEADER.size:]) != crc:
+        raise ValueError("Partida salva corrompida")
+
+    side = order * order
+    size = digits_size(order)
+    start = HEADER.size
+    board = unpack_board(data[start:start + size], order)
+    solution = unpack_board(data[start + size:start + 2 * size], order)
+    hidden = np.unpackbits(np.frombuffer(data[start + 2 * size:], dtype=np.uint8), count=side * side)
+    return {
+        "order": order,
+        "difficulty": DIFFICULTY_NAMES[difficulty],
+        "board": board,
+        "solution": solution,
+        "hidden": hidden.astype(bool).reshape(side, side),
+        "lives": lives,
+        "hints_left": hints_left,
+        "elapsed_ms": elapsed_ms,
+    }
+
+
+def write_save(path, data):
+    """Grava de forma atômica: arquivo temporário + fsync + rename"""
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def load_save(path):
+    """Partida salva em `path`, ou None se não existir ou estiver corrompida"""
+    try:
+        with open(path, "rb") as f:
+            return unpack_save(f.read())
+    except FileNotFoundError:
+        return None
+    except ValueError as e:
+        print(f"Ignorando {path}: {e}")
+        return None
+
+
+def delete_save(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class Autosaver:
+    """
+    Grava partidas numa thread de fundo para não travar o quadro.
+    Só o registro mais recente importa: pedidos feitos enquanto uma gravação
+    está em andamento substituem os anteriores.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.pending = None
+        self.saves = 0
+        self.generation = 0  # Muda a cada discard(): registros anteriores não são gravados
+        self.lock = threading.Lock()        # Protege pending/generation (rápido)
+        self.write_lock = threading.Lock()  # Serializa o acesso ao arquivo
+        self.wakeup = threading.Event()
+        self.running = True
+        self.thread = threading.Thread(target=self.worker, name="autosave", daemon=True)
+        self.thread.start()
+
+    def save(self, data):
+        """Agenda a gravação de `data` (bytes de pack_save) sem esperar o disco"""
+        with self.lock:
+            self.pending = data
+        self.wakeup.set()
+
+    def discard(self):
+        """Cancela a gravação pendente e apaga a partida salva (fim de jogo)"""
+        with self.lock:
+            self.pending = None
+            self.generation += 1
+        with self.write_lock:
+            delete_save(self.path)
+
+    def stop(self):
+        """Grava o que estiver pendente e encerra a thread"""
+        self.running = False
+        self.wakeup.set()
+        self.thread.join()
+
+    def flush(self):
+        with self.lock:
+            data, self.pending = self.pending, None
+            generation = self.generation
+        if data is None:
+            return
+        with self.write_lock:
+            if generation != self.generation:
+                return
+            try:
+                write_save(self.path, data)
+                self.saves += 1
+            except OSError as e:
+                print(f"Falha ao salvar a partida em {self.path}: {e}")
+
+    def worker(self):
+        while self.running:
+            self.wakeup.wait()
+            self.wakeup.clear()
+            self.flush()
+        self.flush()
@@ -0,0 +1,67 @@
+import time
+
+# Estados da busca
+RUNNING = "running"
+SOLVED = "solved"
+UNSOLVABLE = "unsolvable"
+
+# Resultados de run() que deixam a busca pausada (basta chamar run() de novo)
+EXHAUSTED = "budget_exhausted"
+STOPPED = "stopped"
+
+
+class SteppedSearch:
+    """
+    Busca com pilha explícita em vez de recursão: cada chamada de step()
+    avança até o próximo evento e a busca pode ser pausada e retomada
+    entre eles.
+
+    Subclasses implementam step(), que retorna (row, col, num, is_backtrack)
+    ou None quando a busca termina, e mantêm self.status e self.nodes.
+    """
+
+    status = RUNNING
+    nodes = 0  # Candidatos testados
+
+    def run(self, callback=None, max_nodes=None, max_time=None):
+        """
+        Avança a busca até terminar ou estourar o orçamento
+        callback(row, col, num, is_backtrack); retornar False pausa a busca
+        max_nodes: candidatos testados nesta chamada; max_time: segundos
+        Retorna SOLVED, UNSOLVABLE, EXHAUSTED ou STOPPED
+        """
+        node_limit = self.nodes + max_nodes if max_nodes is not None else None
+        deadline = time.perf_counter() + max_time if max_time is not None else None
+
+        while True:
+            event = self.step()
+            if event is None:
+                return self.status
+
+            if callback and not callback(*event):
+                return STOPPED
+            if self.status != RUNNING:
+                continue
+
+            if node_limit is not None and self.nodes >= node_limit:
+                return EXHAUSTED
+            if deadline is not None and time.perf_counter() >= deadline:
+                return EXHAUSTED
+
+    def steps(self, max_nodes=None):
+        """
+        Gerador dos eventos (row, col, num, is_backtrack), um por next(), para
+        quem consome a busca aos poucos (ex.: a tela, alguns passos por quadro).
+        Só a pilha da busca fica em memória. O valor de retorno do gerador é o
+        resultado (SOLVED, UNSOLVABLE ou EXHAUSTED); fechá-lo só pausa a busca.
+        """
+        node_limit = self.nodes + max_nodes if max_nodes is not None else None
+
+        while True:
+            event = self.step()
+            if event is None:
+                return self.status
+            yield event
+
+            if self.status == RUNNING and node_limit is not None and self.nodes >= node_limit:
+                return EXHAUSTED
@@ -0,0 +1,75 @@
+from collections import OrderedDict
+import numpy as np
+
+# Limites do cache compartilhado: nº de resultados e memória total estimada
+SOLVE_CACHE_ENTRIES = 64
+SOLVE_CACHE_BYTES = 8 << 20  # 8 MiB
+
+
+def board_key(board):
+    """
+    Chave do estado do tabuleiro: lado + dígitos como bytes (uint8).
+    O hash de bytes é rápido e, ao contrário de um hash resumido, não colide.
+    """
+    board = np.asarray(board)
+    return board.shape[0], board.astype(np.uint8).tobytes()
+
+
+class SolveCache:
+    """
+    Resultados do solver por estado do tabuleiro, com descarte LRU quando passa
+    de max_entries resultados ou de max_bytes de memória. Os valores guardados
+    são compartilhados: quem os recebe não deve alterá-los.
+    """
+
+    def __init__(self, max_entries=SOLVE_CACHE_ENTRIES, max_bytes=SOLVE_CACHE_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # chave -> (valor, bytes)
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Valor guardado para `key` (marcado como usado agora), ou None"""
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, value, size):
+        """Guarda `value` (ocupando `size` bytes) e descarta os menos usados acima dos limites"""
+        if size > self.max_bytes:
+            return
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.bytes -= old[1]
+        self.entries[key] = (value, size)
+        self.bytes += size
+        while len(self.entries) > self.max_entries or self.bytes > self.max_bytes:
+            _, (_, evicted) = self.entries.popitem(last=False)
+            self.bytes -= evicted
+            self.evictions += 1
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes = 0
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "size": len(self.entries),
+            "kib": round(self.bytes / 1024, 1),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+# Cache único compartilhado pela tela do jogo e pelas ferramentas
+SOLVE_CACHE = SolveCache()
@@ -1,108 +1,335 @@
-import pygame
+import random
 import numpy as np
-from collections import defaultdict
+from .dlx import DancingLinks
+from .geometry import geometry, board_order
+from .search import SteppedSearch, RUNNING, SOLVED, UNSOLVABLE
+
+# Motores de resolução disponíveis
+BACKENDS = ("backtracking", "dlx")
+
+# Tabelas do tabuleiro 9x9, usadas direto pelos módulos que só tratam 9x9
+_GEOMETRY_9 = geometry(3)
+
+# Máscara com os bits 1-9 ligados (bit d representa o dígito d)
+FULL_MASK = _GEOMETRY_9.full_mask
+
+# Tabela de contagem de bits para máscaras de candidatos
+POPCOUNT = [_GEOMETRY_9.popcount(mask) for mask in range(FULL_MASK + 1)]
+
+# Dígitos presentes em cada máscara, em ordem crescente
+MASK_DIGITS = [_GEOMETRY_9.digits(mask) for mask in range(FULL_MASK + 1)]
+
+# Bloco 3x3 de cada célula (índice linear 0-80)
+CELL_BOX = _GEOMETRY_9.cell_box
+
+# Vizinhos de cada célula (mesma linha, coluna ou bloco)
+PEERS = _GEOMETRY_9.peers
+
+
+class SudokuSolver(SteppedSearch):
+    """
+    Backtracking com MRV sobre máscaras de bits, numa pilha explícita:
+    a busca pode ser pausada, retomada e limitada por nós ou tempo.
+    """
+
+    def __init__(self, board, backend="backtracking", randomize=True):
+        if backend not in BACKENDS:
+            raise ValueError(f"Backend desconhecido: {backend}")
 
-class SudokuSolver:
-    def __init__(self, board):
         self.board = board
-        self.invalid_numbers = defaultdict(set)  # Memoization de números inválidos
-        
+        self.backend = backend
+        self.randomize = randomize  # Candidatos em ordem aleatória para variar
+        self.geometry = geometry(board_order(board))
+        self.nodes = 0
+        self.result = None  # Último resultado de solve_visually
+        self.load()
+
+    def load(self):
+        """Recalcula máscaras e buckets a partir do tabuleiro"""
+        g = self.geometry
+        self.side = g.side
+        self.cell_row, self.cell_col, self.cell_box = g.cell_row, g.cell_col, g.cell_box
+
+        # Máscaras de dígitos usados por linha, coluna e bloco
+        self.rows = [0] * g.side
+        self.cols = [0] * g.side
+        self.boxes = [0] * g.side
+        self.values = [int(v) for v in np.asarray(self.board).flatten()]
+        self.consistent = True
+
+        for i, num in enumerate(self.values):
+            if num:
+                bit = 1 << num
+                if (self.rows[g.cell_row[i]] | self.cols[g.cell_col[i]] | self.boxes[g.cell_box[i]]) & bit:
+                    self.consistent = False  # Dígito repetido numa unidade
+                self.rows[g.cell_row[i]] |= bit
+                self.cols[g.cell_col[i]] |= bit
+                self.boxes[g.cell_box[i]] |= bit
+
+        # Células vazias agrupadas pelo número de candidatos (MRV incremental)
+        self.counts = [0] * g.cells
+        self.buckets = [set() for _ in range(g.side + 1)]
+        for i, num in enumerate(self.values):
+            if not num:
+                count = g.popcount(self.candidates(i))
+                self.counts[i] = count
+                self.buckets[count].add(i)
+
+        self.dlx = None
+        self.reset()
+
+    def reset(self):
+        """Prepara a pilha da busca a partir do tabuleiro atual"""
+        # Cada quadro: [célula, candidatos em ordem de tentativa, próximo a testar]
+        self.stack = []
+        self.status = RUNNING if self.consistent else UNSOLVABLE
+        if self.consistent:
+            self.descend()
+
+    def candidates(self, i):
+        """Retorna a máscara de candidatos da célula i"""
+        return self.geometry.full_mask & ~(
+            self.rows[self.cell_row[i]] | self.cols[self.cell_col[i]] | self.boxes[self.cell_box[i]]
+        )
+
+    def place(self, i, num):
+        """Coloca um número na célula i atualizando máscaras e buckets"""
+        bit = 1 << num
+        values = self.values
+
+        # Vizinhos vazios que perdem este candidato
+        affected = [p for p in self.geometry.peers[i] if not values[p] and self.candidates(p) & bit]
+
+        self.buckets[self.counts[i]].discard(i)
+        values[i] = num
+        self.board[self.cell_row[i]][self.cell_col[i]] = num
+        self.rows[self.cell_row[i]] |= bit
+        self.cols[self.cell_col[i]] |= bit
+        self.boxes[self.cell_box[i]] |= bit
+
+        for p in affected:
+            count = self.counts[p]
+            self.buckets[count].discard(p)
+            self.buckets[count - 1].add(p)
+            self.counts[p] = count - 1
+
+    def remove(self, i):
+        """Desfaz a jogada da célula i (inverso de place)"""
+        num = self.values[i]
+        bit = 1 << num
+        values = self.values
+
+        values[i] = 0
+        self.board[self.cell_row[i]][self.cell_col[i]] = 0
+        self.rows[self.cell_row[i]] &= ~bit
+        self.cols[self.cell_col[i]] &= ~bit
+        self.boxes[self.cell_box[i]] &= ~bit
+
+        # Vizinhos vazios que recuperam o candidato
+        for p in self.geometry.peers[i]:
+            if not values[p] and self.candidates(p) & bit:
+                count = self.counts[p]
+                self.buckets[count].discard(p)
+                self.buckets[count + 1].add(p)
+                self.counts[p] = count + 1
+
+        count = self.geometry.popcount(self.candidates(i))
+        self.counts[i] = count
+        self.buckets[count].add(i)
+
+    def next_cell(self):
+        """Índice da célula vazia com menos candidatos, ou None"""
+        for bucket in self.buckets:
+            if bucket:
+                return next(iter(bucket))
+        return None
+
     def find_empty(self):
         """Encontra a célula vazia com menos opções (heurística MRV)"""
-        best = None
-        min_options = 10
-        
-        for i in range(9):
-            for j in range(9):
-                if self.board[i][j] == 0:
-                    # Conta opções válidas
-                    options = [num for num in range(1,10) 
-                              if self.is_valid(num, (i,j))]
-                    
-                    if len(options) < min_options:
-                        min_options = len(options)
-                        best = (i, j)
-                        if min_options == 1:  # Otimização
-                            return best
-        return best
-    
+        i = self.next_cell()
+        if i is None:
+            return None
+        return (i // self.side, i % self.side)
+
     def is_valid(self, num, pos):
         """Verifica se um número é válido em uma posição"""
         row, col = pos
-        
-        # Verifica se o número já foi marcado como inválido
-        if num in self.invalid_numbers[(row, col)]:
-            return False
-            
-        # Verifica linha e coluna
-        if num in self.board[row, :] or num in self.board[:, col]:
-            return False
-            
-        # Verifica bloco 3x3
-        box_x, box_y = col // 3, row // 3
-        if num in self.board[box_y*3:(box_y+1)*3, box_x*3:(box_x+1)*3]:
-            return False
-            
-        return True
-    
-    def solve_visually(self, callback=None):
+        box = self.cell_box[row * self.side + col]
+        return not (self.rows[row] | self.cols[col] | self.boxes[box]) & (1 << num)
+
+    def solve_visually(self, callback=None, max_nodes=None, max_time=None):
         """
-        Resolve com backtracking + MRV + memoization
+        Resolve com o backend escolhido
         callback(row, col, num, is_backtrack)
+        Retorna True se resolveu; o resultado detalhado (SOLVED, UNSOLVABLE,
+        EXHAUSTED ou STOPPED) fica em self.result. Nos dois últimos, chamar
+        de novo retoma a busca de onde parou.
         """
-        empty = self.find_empty()
-        if not empty:
-            return True
-            
-        row, col = empty
-        
-        # Tenta números em ordem aleatória para variar
-        for num in np.random.permutation(range(1, 10)):
-            if self.is_valid(num, (row, col)):
-                self.board[row][col] = num
-                
-                if callback and not callback(row, col, num, False):
-                    return False
-                
-                if self.solve_visually(callback):
-                    return True
-                
-                # Backtrack
-                self.board[row][col] = 0
-                self.invalid_numbers[(row, col)].add(num)  # Memoization
-                
-                if callback and not callback(row, col, 0, True):
-                    return False
-        
-        # Limpa memoization para esta célula
-        self.invalid_numbers[(row, col)].clear()
-        return False
+        self.result = self.engine().run(callback, max_nodes, max_time)
+        self.sync()
+        return self.result == SOLVED
+
+    def solve_steps(self, max_nodes=None):
+        """
+        Versão geradora de solve_visually: cada next() devolve um evento
+        (row, col, num, is_backtrack), sem callback nem espera.
+        Ao fim do gerador, o resultado fica em self.result.
+        """
+        self.result = yield from self.engine().steps(max_nodes)
+        self.sync()
+
+    def engine(self):
+        """Busca do backend escolhido: o próprio solver ou o DLX"""
+        if self.backend != "dlx":
+            return self
+        if self.dlx is None:
+            self.dlx = DancingLinks(self.board, self.randomize)
+        return self.dlx
+
+    def sync(self):
+        """Depois do DLX, alinha contagem de nós, máscaras e buckets ao tabuleiro"""
+        if self.dlx is None:
+            return
+        self.nodes = self.dlx.nodes
+        if self.dlx.status != RUNNING:
+            self.load()
+
+    def descend(self):
+        """Empilha a próxima célula (MRV) ou marca a solução encontrada"""
+        i = self.next_cell()
+        if i is None:
+            self.status = SOLVED
+            return
+
+        options = list(self.geometry.digits(self.candidates(i)))
+        if self.randomize:
+            random.shuffle(options)
+        self.stack.append([i, options, 0])
+
+    def step(self):
+        """Coloca ou desfaz um número; None quando a busca termina"""
+        while self.status == RUNNING:
+            frame = self.stack[-1]
+            i, options, k = frame
+            row, col = i // self.side, i % self.side
+
+            if self.values[i]:
+                # O ramo abaixo falhou: desfaz e tenta o próximo candidato
+                self.remove(i)
+                return (row, col, 0, True)
+
+            if k == len(options):
+                self.stack.pop()
+                if not self.stack:
+                    self.status = UNSOLVABLE
+                continue
+
+            num = options[k]
+            frame[2] = k + 1
+            self.nodes += 1
+            self.place(i, num)
+            self.descend()
+            return (row, col, num, False)
+
+        return None
 
     def get_hint(self):
         """
         Retorna uma célula e número válido para dica
         Formato: (row, col, num) ou None se não encontrar
         """
+        side = self.side
+        digits = self.geometry.digits
+
         # Lista de células vazias
-        empty_cells = [(i,j) for i in range(9) for j in range(9) 
-                      if self.board[i][j] == 0]
-        
+        empty_cells = [i for i in range(self.geometry.cells) if not self.values[i]]
+
         # Embaralha para evitar padrões
-        import random
         random.shuffle(empty_cells)
-        
+
         # Primeiro tenta células com apenas uma possibilidade
-        for row, col in empty_cells:
-            options = [num for num in range(1,10) 
-                      if self.is_valid(num, (row,col))]
-            if len(options) == 1:
-                return (row, col, options[0])
-        
+        for i in empty_cells:
+            if self.counts[i] == 1:
+                return (i // side, i % side, digits(self.candidates(i))[0])
+
         # Depois tenta qualquer célula válida
-        for row, col in empty_cells:
-            options = [num for num in range(1,10) 
-                      if self.is_valid(num, (row,col))]
+        for i in empty_cells:
+            options = digits(self.candidates(i))
             if options:
-                return (row, col, random.choice(options))
-        
+                return (i // side, i % side, random.choice(options))
+
         return None
+
+
+def count_solutions(board, limit=2, max_nodes=None):
+    """
+    Conta as soluções do tabuleiro, parando ao atingir `limit`
+    (com limit=2 basta para saber se a solução é única).
+    Com `max_nodes`, desiste depois de testar esse número de candidatos e
+    retorna `limit`: uma busca inconclusiva conta como "não única".
+    """
+    g = geometry(board_order(board))
+    full_mask, popcount, digits = g.full_mask, g.popcount, g.digits
+    cell_row, cell_col, cell_box = g.cell_row, g.cell_col, g.cell_box
+
+    values = [int(v) for v in np.asarray(board).flatten()]
+    rows = [0] * g.side
+    cols = [0] * g.side
+    boxes = [0] * g.side
+
+    for i, num in enumerate(values):
+        if num:
+            bit = 1 << num
+            if (rows[cell_row[i]] | cols[cell_col[i]] | boxes[cell_box[i]]) & bit:
+                return 0
+            rows[cell_row[i]] |= bit
+            cols[cell_col[i]] |= bit
+            boxes[cell_box[i]] |= bit
+
+    empty = [i for i in range(g.cells) if not values[i]]
+    total = len(empty)
+    budget = [max_nodes if max_nodes is not None else -1]
+
+    def search(k):
+        if k == total:
+            return 1
+
+        # MRV entre as células ainda vazias (empty[k:])
+        best = k
+        best_mask = 0
+        best_count = g.side + 1
+        for pos in range(k, total):
+            i = empty[pos]
+            mask = full_mask & ~(rows[cell_row[i]] | cols[cell_col[i]] | boxes[cell_box[i]])
+            count = popcount(mask)
+            if count < best_count:
+                best, best_mask, best_count = pos, mask, count
+                if count <= 1:
+                    break
+
+        if best_count == 0:
+            return 0
+
+        empty[k], empty[best] = empty[best], empty[k]
+        i = empty[k]
+        r, c, b = cell_row[i], cell_col[i], cell_box[i]
+
+        found = 0
+        for num in digits(best_mask):
+            if budget[0] == 0:
+                return limit
+            budget[0] -= 1
+            bit = 1 << num
+            rows[r] |= bit
+            cols[c] |= bit
+            boxes[b] |= bit
+            found += search(k + 1)
+            rows[r] &= ~bit
+            cols[c] &= ~bit
+            boxes[b] &= ~bit
+            if found >= limit:
+                break
+
+        return found
+
+    return min(search(0), limit)
@@ -0,0 +1,203 @@
+import time
+from array import array
+import numpy as np
+from .geometry import board_order
+from .solver import SudokuSolver
+from .solve_cache import SOLVE_CACHE, board_key
+
+# Cada passo cabe em 16 bits: célula (10 bits, até 625 no 25x25),
+# dígito (5 bits) e um bit de backtrack. No backtrack o dígito é o que foi
+# removido, o que permite reproduzir o trace de trás para frente.
+CELL_BITS = 10
+DIGIT_BITS = 5
+CELL_MASK = (1 << CELL_BITS) - 1
+DIGIT_MASK = (1 << DIGIT_BITS) - 1
+BACKTRACK_FLAG = 1 << (CELL_BITS + DIGIT_BITS)
+
+# Um snapshot do tabuleiro a cada N passos: seek(k) reaplica no máximo N-1 passos
+SNAPSHOT_INTERVAL = 256
+
+
+def pack_step(cell, digit, is_backtrack):
+    return cell | (digit << CELL_BITS) | (BACKTRACK_FLAG if is_backtrack else 0)
+
+
+def unpack_step(code):
+    """Passo empacotado -> (célula, dígito, is_backtrack)"""
+    return code & CELL_MASK, (code >> CELL_BITS) & DIGIT_MASK, bool(code & BACKTRACK_FLAG)
+
+
+def trace_key(board, backend, max_nodes):
+    """Chave de SOLVE_CACHE para o trace de `board` com esse backend e orçamento"""
+    return board_key(board), backend, max_nodes
+
+
+class SolverTrace:
+    """
+    Histórico completo de uma resolução (colocações e backtracks) num array
+    de uint16, mais snapshots periódicos do tabuleiro para saltos rápidos.
+    Gravar separa o custo de resolver do custo de desenhar.
+    """
+
+    def __init__(self, givens, steps, result, snapshot_interval=SNAPSHOT_INTERVAL):
+        self.givens = np.asarray(givens, dtype=np.uint8).copy()
+        self.side = len(self.givens)
+        self.steps = np.asarray(steps, dtype=np.uint16)
+        self.result = result
+        self.snapshot_interval = snapshot_interval
+        self.build_snapshots()
+
+    @classmethod
+    def record(cls, solver, max_nodes=None, snapshot_interval=SNAPSHOT_INTERVAL):
+        """Roda o solver até o fim (ou o orçamento) gravando cada passo"""
+        recorder = TraceRecorder(solver, max_nodes, snapshot_interval)
+        recorder.advance()
+        return recorder.trace()
+
+    @classmethod
+    def solve(cls, board, backend="backtracking", max_nodes=None, cache=SOLVE_CACHE):
+        """
+        Trace da resolução de `board`; se o mesmo estado já foi resolvido com o
+        mesmo backend e orçamento, devolve o trace guardado em vez de resolver
+        """
+        key = trace_key(board, backend, max_nodes)
+        trace = cache.get(key)
+        if trace is None:
+            trace = cls.record(SudokuSolver(np.array(board, dtype=int), backend), max_nodes)
+            cache.put(key, trace, trace.nbytes)
+        return trace
+
+    def build_snapshots(self):
+        """Tabuleiro (achatado) antes de cada bloco de snapshot_interval passos"""
+        values = self.givens.flatten()
+        total = len(self.steps)
+        snapshots = np.empty((total // self.snapshot_interval + 1, len(values)), dtype=np.uint8)
+
+        cells = self.steps & CELL_MASK
+        digits = (self.steps >> CELL_BITS) & DIGIT_MASK
+        digits[self.steps & BACKTRACK_FLAG != 0] = 0  # Depois do backtrack a célula fica vazia
+        for n, start in enumerate(range(0, total + 1, self.snapshot_interval)):
+            snapshots[n] = values
+            end = min(start + self.snapshot_interval, total)
+            # Aplica o bloco: vale a última escrita de cada célula
+            block = cells[start:end][::-1]
+            written, last = np.unique(block, return_index=True)
+            values[written] = digits[start:end][::-1][last]
+        self.snapshots = snapshots
+
+    def __len__(self):
+        return len(self.steps)
+
+    @property
+    def nbytes(self):
+        """Memória ocupada pelos arrays do trace"""
+        return self.givens.nbytes + self.steps.nbytes + self.snapshots.nbytes
+
+    def step(self, k):
+        """Passo k como (row, col, num, is_backtrack), no formato do solver"""
+        cell, digit, is_backtrack = unpack_step(int(self.steps[k]))
+        return cell // self.side, cell % self.side, 0 if is_backtrack else digit, is_backtrack
+
+    def values_at(self, k):
+        """Tabuleiro achatado depois dos k primeiros passos"""
+        k = max(0, min(k, len(self.steps)))
+        block = k // self.snapshot_interval
+        values = self.snapshots[block].copy()
+        for code in self.steps[block * self.snapshot_interval:k]:
+            cell, digit, is_backtrack = unpack_step(int(code))
+            values[cell] = 0 if is_backtrack else digit
+        return values
+
+    def board_at(self, k):
+        return self.values_at(k).reshape(self.side, self.side)
+
+    def save(self, path):
+        """Salva em .npz (os snapshots são refeitos ao carregar)"""
+        np.savez_compressed(path, givens=self.givens, steps=self.steps, result=self.result)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(data["givens"], data["steps"], str(data["result"]))
+
+
+class TraceRecorder:
+    """
+    Gravação de um trace em partes: cada advance() consome eventos do solver
+    até um limite de tempo, para a tela gravar alguns ms por quadro em vez de
+    travar até a busca terminar.
+    """
+
+    def __init__(self, solver, max_nodes=None, snapshot_interval=SNAPSHOT_INTERVAL):
+        board_order(solver.board)  # Valida o tamanho antes de gravar
+        self.solver = solver
+        self.givens = np.array(solver.board, dtype=np.uint8)
+        self.side = len(self.givens)
+        self.values = self.givens.flatten()
+        self.steps = array("H")
+        self.snapshot_interval = snapshot_interval
+        self.events = solver.solve_steps(max_nodes)
+        self.done = False
+
+    def advance(self, max_time=None):
+        """Grava até a busca terminar ou até `max_time` segundos; True se terminou"""
+        deadline = time.perf_counter() + max_time if max_time is not None else None
+        side, values, steps = self.side, self.values, self.steps
+
+        for row, col, num, is_backtrack in self.events:
+            cell = row * side + col
+            if is_backtrack:
+                steps.append(pack_step(cell, int(values[cell]), True))
+            else:
+                steps.append(pack_step(cell, num, False))
+            values[cell] = num
+            if deadline is not None and time.perf_counter() >= deadline:
+                return False
+
+        self.done = True
+        return True
+
+    def trace(self):
+        """SolverTrace da gravação (depois que advance() retornou True)"""
+        return SolverTrace(self.givens, self.steps, self.solver.result, self.snapshot_interval)
+
+
+class TracePlayer:
+    """Cursor de reprodução de um trace: avança, volta ou salta para um passo"""
+
+    def __init__(self, trace):
+        self.trace = trace
+        self.position = 0  # Passos já aplicados
+        self.values = trace.values_at(0)
+
+    @property
+    def board(self):
+        return self.values.reshape(self.trace.side, self.trace.side)
+
+    def at_end(self):
+        return self.position >= len(self.trace)
+
+    def forward(self):
+        """Aplica o próximo passo e o retorna, ou None no fim"""
+        if self.at_end():
+            return None
+        event = self.trace.step(self.position)
+        row, col, num, _ = event
+        self.values[row * self.trace.side + col] = num
+        self.position += 1
+        return event
+
+    def backward(self):
+        """Desfaz o último passo e o retorna, ou None no início"""
+        if self.position == 0:
+            return None
+        self.position -= 1
+        cell, digit, is_backtrack = unpack_step(int(self.trace.steps[self.position]))
+        # Desfazer uma colocação esvazia a célula; desfazer um backtrack devolve o dígito
+        self.values[cell] = digit if is_backtrack else 0
+        return self.trace.step(self.position)
+
+    def seek(self, k):
+        """Salta para o passo k a partir do snapshot mais próximo"""
+        self.position = max(0, min(k, len(self.trace)))
+        self.values = self.trace.values_at(self.position)
@@ -1,81 +1,45 @@
 import pygame
-import sys
-from .settings import COLORS, FONT_PATH, FONT_SIZE, FONT_FALLBACK, ABOUT_INFO
+from .settings import COLORS, FONT_SIZE, ABOUT_INFO
+from .assets import ASSETS
+from .widgets import WidgetScreen, Label
 
-class AboutScreen:
+class AboutScreen(WidgetScreen):
     def __init__(self, screen):
-        self.screen = screen
-        self.clock = pygame.time.Clock()
+        super().__init__(screen, COLORS['bg'])
         
-        try:
-            self.font = pygame.font.Font(FONT_PATH, FONT_SIZE)
-        except:
-            self.font = pygame.font.SysFont(FONT_FALLBACK, FONT_SIZE)
+        self.font = ASSETS.font(FONT_SIZE)
         
-        # Efeitos de animação
-        self.alpha = 0
-        self.fade_in = True
-    
-    def draw(self):
-        # Animação de fade in
-        if self.fade_in and self.alpha < 255:
-            self.alpha += 5
-            overlay = pygame.Surface(self.screen.get_size(), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 255 - self.alpha))
-        
-        self.screen.fill(COLORS['bg'])
+        center_x = self.screen.get_width()//2
         
         # Título
-        title = self.font.render(ABOUT_INFO['title'], True, COLORS['selected'])
-        title_rect = title.get_rect(center=(self.screen.get_width()//2, 80))
-        self.screen.blit(title, title_rect)
+        self.widgets = [Label(self.font, ABOUT_INFO['title'], COLORS['selected'], (center_x, 80))]
         
         # Descrição
         y_pos = 150
         for line in ABOUT_INFO['description']:
             if line:
-                text = self.font.render(line, True, COLORS['text'])
-                text_rect = text.get_rect(center=(self.screen.get_width()//2, y_pos))
-                self.screen.blit(text, text_rect)
+                self.widgets.append(Label(self.font, line, COLORS['text'], (center_x, y_pos)))
             y_pos += 30
         
         # Equipe
         y_pos += 20
         for line in ABOUT_INFO['team']:
             if line:
-                text = self.font.render(line, True, COLORS['text'])
-                text_rect = text.get_rect(center=(self.screen.get_width()//2, y_pos))
-                self.screen.blit(text, text_rect)
+                self.widgets.append(Label(self.font, line, COLORS['text'], (center_x, y_pos)))
             y_pos += 30
         
         # Instrução para voltar
-        back_text = self.font.render("Pressione ESC para voltar", True, COLORS['about_text'])
-        back_rect = back_text.get_rect(center=(self.screen.get_width()//2, self.screen.get_height() - 50))
-        self.screen.blit(back_text, back_rect)
-        
-        # Finaliza animação de entrada
-        if self.fade_in and self.alpha < 255:
-            self.screen.blit(overlay, (0, 0))
-            
-        pygame.display.flip()
+        self.widgets.append(Label(
+            self.font, "Pressione ESC para voltar", COLORS['about_text'],
+            (center_x, self.screen.get_height() - 50)
+        ))
     
-    def handle_events(self):
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                return "back"
+    def handle_event(self, event):
+        super().handle_event(event)
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+            return "back"
         return None
     
     def run(self):
-        self.fade_in = True
-        self.alpha = 0
-        
-        while True:
-            action = self.handle_events()
-            if action == "back":
-                return
-            
-            self.draw()
-            self.clock.tick(60)
+        self.start()
+        self.loop.run(self)
@@ -0,0 +1,65 @@
+import time
+import pygame
+from .settings import FONT_PATH, FONT_FALLBACK
+
+
+class AssetManager:
+    """
+    Fontes e imagens compartilhadas por todas as telas: cada arquivo é lido e
+    convertido para o formato da tela uma vez só, na primeira vez que é pedido,
+    e as variações redimensionadas também ficam guardadas.
+    Por isso só pode ser usado depois de pygame.display.set_mode.
+    """
+
+    def __init__(self):
+        self.fonts = {}
+        self.images = {}
+        self.load_ms = {}  # Arquivo/variação -> tempo de carga em ms
+
+    def font(self, size, path=FONT_PATH):
+        """Fonte no tamanho pedido; sem o arquivo, usa FONT_FALLBACK do sistema"""
+        key = (path, size)
+        font = self.fonts.get(key)
+        if font is None:
+            start = time.perf_counter()
+            try:
+                font = pygame.font.Font(path, size)
+            except (OSError, pygame.error):
+                font = pygame.font.SysFont(FONT_FALLBACK, size)
+                print(f"Fonte {path} não encontrada, usando {FONT_FALLBACK}")
+            self.fonts[key] = font
+            self.load_ms[f"{path}@{size}"] = (time.perf_counter() - start) * 1000
+        return font
+
+    def image(self, path, size=None, alpha=True):
+        """
+        Imagem já convertida (convert_alpha ou convert); com `size`, a variação
+        redimensionada, calculada a partir da original uma vez só
+        """
+        key = (path, size, alpha)
+        image = self.images.get(key)
+        if image is not None:
+            return image
+
+        original = self.image(path, alpha=alpha) if size is not None else None
+        start = time.perf_counter()
+        if original is None:
+            image = pygame.image.load(path)
+            image = image.convert_alpha() if alpha else image.convert()
+        else:
+            image = pygame.transform.scale(original, size)
+        self.images[key] = image
+        name = path if size is None else f"{path}@{size[0]}x{size[1]}"
+        self.load_ms[name] = (time.perf_counter() - start) * 1000
+        return image
+
+    def stats(self):
+        return {
+            "fonts": len(self.fonts),
+            "images": len(self.images),
+            "load_ms": round(sum(self.load_ms.values()), 1),
+        }
+
+
+# Gerenciador único compartilhado por todas as telas
+ASSETS = AssetManager()
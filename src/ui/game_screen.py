@@ -1,19 +1,42 @@
+import time
+import numpy as np
 import pygame
 from pygame.locals import *
 from ..core.game import SudokuGame
+from ..core.search import SOLVED, EXHAUSTED, STOPPED
 from ..core.solver import SudokuSolver
+from ..core.trace import TraceRecorder, TracePlayer, trace_key
+from ..core.solve_cache import SOLVE_CACHE
+from ..core.save import Autosaver, pack_save
+from .text_cache import TEXT_CACHE
+from .assets import ASSETS
+from .settings import FONT_SIZE, HEART_IMAGE, SAVE_PATH, SOLVER_RECORD_SLICE
+from .loop import LoopRunner
+from .profiler import FrameProfiler
+
+# Símbolos das células: dígitos até 9, letras a partir do 10 (16x16 e 25x25)
+SYMBOLS = "123456789ABCDEFGHIJKLMNOP"
+
+# Fase do perfil (F3) em que cada tipo de região é desenhado; o resto conta como "hud"
+ELEMENT_PHASES = {
+    'cell': 'células', 'lives': 'vidas',
+    'solve': 'botões', 'hint': 'botões', 'speed': 'botões', 'control': 'botões'
+}
 
 class GameScreen:
-    def __init__(self, screen, difficulty):
+    def __init__(self, screen, difficulty, puzzle=None, bank=None, order=3):
         self.screen = screen
         self.difficulty = difficulty
-        self.game = SudokuGame(screen, difficulty)
-        self.solver = SudokuSolver(self.game.board.copy())
-        self.font = pygame.font.Font('assets/fonts/PressStart2P-Regular.ttf', 24)
-        self.small_font = pygame.font.Font('assets/fonts/PressStart2P-Regular.ttf', 16)
+        self.game = SudokuGame(screen, difficulty, puzzle, bank, order=order)
+        self.order = self.game.order
+        self.side = self.game.side
+        # Fonte das células encolhe junto com elas nos tabuleiros maiores;
+        # fontes e imagem vêm do ASSETS, carregadas só no primeiro jogo
+        self.font = ASSETS.font(24 * 9 // self.side)
+        self.small_font = ASSETS.font(FONT_SIZE)
+        self.hud_font = ASSETS.font(7)
         self.lives = 3
-        self.heart_img = pygame.image.load('assets/images/heart.png').convert_alpha()
-        self.heart_img = pygame.transform.scale(self.heart_img, (30, 30))
+        self.heart_img = ASSETS.image(HEART_IMAGE, (30, 30))
         
         # Controles
         self.solve_button = pygame.Rect(650, 20, 120, 40)
@@ -24,7 +47,37 @@ class GameScreen:
             'rápido': pygame.Rect(650, 210, 120, 30)
         }
         self.speed = 200
+        self.solver_backend = 'backtracking'  # ou 'dlx'
+        # Máximo de candidatos testados pelo RESOLVER (~0,35 s de busca no 9x9,
+        # gravada em fatias de SOLVER_RECORD_SLICE ms por quadro)
+        self.solver_budget = 20000
+        
+        # Gravação do trace (em partes, entre quadros) e reprodução, ambas
+        # avançadas a cada quadro por update_solver
+        self.recorder = None
+        self.player = None
+        self.solve_paused = False
+        self.solve_direction = 1  # 1 para frente, -1 para trás
+        self.solve_debt = 0       # ms disponíveis para os próximos passos
+        self.solve_cell = None    # (row, col, is_backtrack) do último passo
+        self.solving = False
+        self.current_step = ""
+        self.message_until = 0
+        self.solve_controls = {
+            'pausar': pygame.Rect(650, 260, 120, 30),
+            'passo': pygame.Rect(650, 300, 120, 30),
+            'voltar': pygame.Rect(650, 340, 120, 30),
+            'parar': pygame.Rect(650, 380, 120, 30)
+        }
         self.hints_left = {'fácil': 5, 'médio': 3, 'difícil': 1}[difficulty]
+        self.profiler = FrameProfiler()
+        
+        # Salvamento automático em segundo plano; o tempo de jogo conta desde a criação
+        self.autosaver = Autosaver(SAVE_PATH)
+        self.finished = False  # Vitória, derrota ou resolvido pelo solver: nada a retomar
+        self.elapsed_before = 0.0
+        self.started_at = time.perf_counter()
+        self.loop = LoopRunner(profiler=self.profiler)
         
         # Cores
         self.colors = {
@@ -41,36 +94,256 @@ class GameScreen:
             'hint_button_hover': (170, 120, 70),
             'speed_button': (80, 80, 80),
             'speed_button_active': (100, 100, 150),
-            'speed_button_hover': (90, 90, 90)
+            'speed_button_hover': (90, 90, 90),
+            'digit_fixed': (255, 255, 255),
+            'digit_player': (100, 100, 255),
+            'digit_wrong': (255, 100, 100),
+            'digit_hint': (0, 200, 200)
         }
         
-        # Tamanhos
-        self.grid_size = 540
-        self.cell_size = self.grid_size // 9
+        # Símbolos do tabuleiro já rasterizados em todas as cores usadas nas células
+        TEXT_CACHE.prebake(
+            self.font, SYMBOLS[:self.side],
+            [self.colors[name] for name in ('digit_fixed', 'digit_player', 'digit_wrong', 'digit_hint')]
+        )
+        
+        # Tamanhos (a grade é ajustada para um múltiplo exato do lado)
+        self.cell_size = 540 // self.side
+        self.grid_size = self.cell_size * self.side
         self.grid_pos = ((800 - self.grid_size) // 2, (600 - self.grid_size) // 2)
         
+        self.grid_rect = pygame.Rect(self.grid_pos, (self.grid_size + 1, self.grid_size + 1)).inflate(2, 2)
+        self.cell_rects = [
+            [
+                pygame.Rect(
+                    self.grid_pos[0] + j * self.cell_size,
+                    self.grid_pos[1] + i * self.cell_size,
+                    self.cell_size, self.cell_size
+                )
+                for j in range(self.side)
+            ]
+            for i in range(self.side)
+        ]
+        self.lives_rect = pygame.Rect(20, 15, 210, 35)
+        self.profiler_rect = pygame.Rect(0, 60, 128, 240)  # À esquerda do tabuleiro
+        
+        # Renderização incremental: (rect, estado) de cada região já desenhada
+        self.drawn = {}
+        self.full_redraw = True
+        self.selected = None
+        self.hint_cell = None
+        self.hint_until = 0
+        
+        # Barra de progresso da reprodução, logo abaixo do tabuleiro
+        self.scrub_bar = pygame.Rect(self.grid_pos[0], self.grid_pos[1] + self.grid_size + 8, self.grid_size, 8)
+        
+        self.build_background()
+    
+    @classmethod
+    def resume(cls, screen, saved):
+        """Recria a partida de um registro de load_save (tabuleiro, vidas, dicas e tempo)"""
+        givens = np.where(saved["hidden"], 0, saved["solution"])
+        puzzle = (givens, saved["solution"], saved["hidden"])
+        game_screen = cls(screen, saved["difficulty"], puzzle, order=saved["order"])
+        game_screen.game.restore_board(saved["board"])
+        game_screen.lives = saved["lives"]
+        game_screen.hints_left = saved["hints_left"]
+        game_screen.elapsed_before = saved["elapsed_ms"] / 1000
+        return game_screen
+    
+    def elapsed(self):
+        """Tempo de jogo em segundos, somando o das sessões anteriores"""
+        return self.elapsed_before + time.perf_counter() - self.started_at
+    
+    def autosave(self):
+        """Agenda a gravação do estado atual; o disco fica com a thread do Autosaver"""
+        if self.finished or self.solving:
+            return
+        self.autosaver.save(pack_save(self.game, self.lives, self.hints_left, self.elapsed() * 1000))
+    
+    def build_background(self):
+        """
+        Pré-compõe a parte fixa da tela (fundo, grade, título das vidas e botões
+        em repouso) numa superfície só, de onde cada região repintada é copiada.
+        Deve ser chamado de novo sempre que o layout mudar.
+        """
+        self.background = pygame.Surface(self.screen.get_size()).convert()
+        self.background.fill(self.colors['bg'])
+        self.draw_grid(self.background)
+        
+        title = TEXT_CACHE.render(self.small_font, "VIDAS:", self.colors['title'])
+        self.background.blit(title, self.lives_rect.topleft)
+        
+        # Botões no estado de repouso; hover e seleção vêm por cima, no quadro
+        self.draw_button(self.solve_button, ("RESOLVER", self.colors['button']), 5, self.background)
+        pygame.draw.rect(self.background, self.colors['hint_button'], self.hint_button, border_radius=5)
+        for speed, rect in self.speed_buttons.items():
+            self.draw_button(rect, (speed.upper(), self.colors['speed_button']), 3, self.background)
+        self.invalidate()
+    
     def draw(self):
-        """Desenha a interface do jogo"""
-        self.screen.fill(self.colors['bg'])
+        """
+        Desenha só o que mudou desde o último quadro: cada região (célula, botão,
+        HUD) tem um estado, e as regiões com estado diferente são repintadas e
+        enviadas com pygame.display.update(rects). Sem mudanças, nada é desenhado.
+        Cada região parte de uma cópia do fundo pré-composto (build_background)
+        e recebe só as camadas dinâmicas: números, seleção, hover e mensagens.
+        """
+        profiler = self.profiler
+        with profiler.phase("estado"):
+            elements, dirty = self.dirty_regions()
+        if not dirty:
+            return
         
-        # Desenha o tabuleiro
-        self.draw_grid()
-        self.draw_numbers()
-        self.draw_selection()
-        self.draw_lives()
-        self.draw_buttons()
+        for area in dirty:
+            self.screen.set_clip(area)
+            with profiler.phase("fundo"):
+                self.screen.blit(self.background, area, area)
+            for key, (rect, state, draw_fn, arg) in elements.items():
+                if rect.colliderect(area):
+                    with profiler.phase(ELEMENT_PHASES.get(key[0] if isinstance(key, tuple) else key, "hud")):
+                        draw_fn(rect, state, arg)
+        self.screen.set_clip(None)
         
-        pygame.display.flip()
+        with profiler.phase("flip"):
+            pygame.display.update(dirty)
+    
+    def dirty_regions(self):
+        """Regiões do quadro e os retângulos cujo estado mudou desde o último desenho"""
+        elements = self.frame_elements()
+        
+        if self.full_redraw:
+            dirty = [self.screen.get_rect()]
+            self.full_redraw = False
+        else:
+            dirty = []
+            for key, (rect, state, _, _) in elements.items():
+                old = self.drawn.get(key)
+                if old is None or old[1] != state or old[0] != rect:
+                    dirty.append(rect)
+                    if old is not None and old[0] != rect:
+                        dirty.append(old[0])
+            # Regiões que sumiram (controles da reprodução, mensagens)
+            dirty += [self.drawn[key][0] for key in self.drawn.keys() - elements.keys()]
+        
+        self.drawn = {key: (rect, state) for key, (rect, state, _, _) in elements.items()}
+        
+        # Muitas regiões pequenas (ex.: salto na reprodução) viram um retângulo só
+        if len(dirty) > 16:
+            dirty = [dirty[0].unionall(dirty[1:])]
+        return elements, dirty
+    
+    def invalidate(self):
+        """Força o próximo draw() a repintar a tela inteira"""
+        self.full_redraw = True
+    
+    def frame_elements(self):
+        """
+        Regiões do quadro atual em ordem de pintura:
+        chave -> (rect, estado, função de desenho, argumento)
+        """
+        elements = {}
+        mouse_pos = pygame.mouse.get_pos()
+        
+        # Células: símbolo, cor e borda de destaque
+        for i in range(self.side):
+            for j in range(self.side):
+                state = self.cell_state(i, j)
+                if state != (None, None, None):
+                    elements[('cell', i, j)] = (self.cell_rects[i][j], state, self.draw_cell, None)
+        
+        # Barra de progresso da reprodução
+        if self.player is not None:
+            total = max(len(self.player.trace), 1)
+            width = self.scrub_bar.width * self.player.position // total
+            elements['scrub'] = (self.scrub_bar, width, self.draw_scrub_bar, None)
+        
+        # HUD de vidas
+        elements['lives'] = (self.lives_rect, self.lives, self.draw_lives, None)
+        
+        # Botões: em repouso já estão no fundo; só hover e seleção viram camada.
+        # O rótulo da DICA muda com o jogo, então é sempre desenhado (cor None = sem fundo)
+        if self.solve_button.collidepoint(mouse_pos):
+            elements['solve'] = (self.solve_button, ("RESOLVER", self.colors['button_hover']), self.draw_button, 5)
+        hover = self.hint_button.collidepoint(mouse_pos)
+        elements['hint'] = (
+            self.hint_button,
+            (f"DICA ({self.hints_left})", self.colors['hint_button_hover'] if hover else None),
+            self.draw_button, 5
+        )
+        for speed, rect in self.speed_buttons.items():
+            active = self.speed == {'lento': 400, 'normal': 200, 'rápido': 50}[speed]
+            if active:
+                btn_color = self.colors['speed_button_active']
+            elif rect.collidepoint(mouse_pos):
+                btn_color = self.colors['speed_button_hover']
+            else:
+                continue
+            elements[('speed', speed)] = (rect, (speed.upper(), btn_color), self.draw_button, 3)
+        
+        # Controles da reprodução em andamento
+        if self.solving:
+            for name, rect in self.solve_controls.items():
+                label = 'seguir' if name == 'pausar' and self.solve_paused else name
+                if name == 'voltar' and self.solve_direction < 0:
+                    label = 'avançar'
+                btn_color = self.colors['speed_button_hover'] if rect.collidepoint(mouse_pos) else self.colors['speed_button']
+                elements[('control', name)] = (rect, (label.upper(), btn_color), self.draw_button, 3)
+        
+        # Explicação do passo atual (por cima da última linha do tabuleiro)
+        if self.current_step:
+            rect = pygame.Rect((20, 550), self.small_font.size(self.current_step))
+            elements['step'] = (rect, self.current_step, self.draw_step_text, None)
+        
+        # HUD do perfil, atualizado a cada 15 quadros medidos
+        if self.profiler.enabled:
+            elements['profiler'] = (self.profiler_rect, self.profiler.frames // 15, self.draw_profiler, None)
+        
+        return elements
+    
+    def cell_state(self, i, j):
+        """(símbolo, cor do símbolo, cor da borda) da célula; None onde não há nada"""
+        num = self.game.board[i][j]
+        hinted = self.hint_cell == (i, j) and pygame.time.get_ticks() < self.hint_until
+        
+        color = None
+        if num != 0:
+            if hinted:
+                color = self.colors['digit_hint']  # Ciano para a dica recém-dada
+            # Durante resolução automática - todos azuis
+            elif self.solving:
+                color = self.colors['digit_player']  # Azul para solver
+            # Células fixas (não editáveis)
+            elif (i, j) not in self.game.hidden_cells:
+                color = self.colors['digit_fixed']  # Branco para fixos
+            # Células editáveis pelo jogador
+            else:
+                # Erro já calculado pelo jogo a cada jogada
+                is_correct = (i, j) not in self.game.wrong_cells
+                color = self.colors['digit_player'] if is_correct else self.colors['digit_wrong']
+        
+        border = None
+        if hinted:
+            border = self.colors['digit_hint']
+        elif self.solve_cell and self.solve_cell[:2] == (i, j):
+            border = (255, 100, 100) if self.solve_cell[2] else (100, 255, 100)
+        elif self.selected == (i, j):
+            border = self.colors['selected']
+        # Número repetido na linha, coluna ou bloco (conjunto mantido pelo jogo)
+        elif (i, j) in self.game.conflicts:
+            border = self.colors['error']
+        
+        return (SYMBOLS[num - 1] if num else None, color, border)
     
-    def draw_grid(self):
-        """Desenha as linhas do tabuleiro"""
-        for i in range(10):
-            # Linhas grossas para os blocos 3x3
-            thickness = 3 if i % 3 == 0 else 1
+    def draw_grid(self, surface):
+        """Desenha as linhas do tabuleiro em `surface` (o fundo pré-composto)"""
+        for i in range(self.side + 1):
+            # Linhas grossas para os blocos
+            thickness = 3 if i % self.order == 0 else 1
             
             # Linhas horizontais
             pygame.draw.line(
-                self.screen, self.colors['grid'],
+                surface, self.colors['grid'],
                 (self.grid_pos[0], self.grid_pos[1] + i * self.cell_size),
                 (self.grid_pos[0] + self.grid_size, self.grid_pos[1] + i * self.cell_size),
                 thickness
@@ -78,148 +351,100 @@ class GameScreen:
             
             # Linhas verticais
             pygame.draw.line(
-                self.screen, self.colors['grid'],
+                surface, self.colors['grid'],
                 (self.grid_pos[0] + i * self.cell_size, self.grid_pos[1]),
                 (self.grid_pos[0] + i * self.cell_size, self.grid_pos[1] + self.grid_size),
                 thickness
             )
     
-    def draw_numbers(self):
-        """Desenha os números no tabuleiro"""
-        for i in range(9):
-            for j in range(9):
-                num = self.game.board[i][j]
-                if num != 0:
-                    # Durante resolução automática - todos azuis
-                    if hasattr(self, 'solving') and self.solving:
-                        color = (100, 100, 255)  # Azul para solver
-                    # Células fixas (não editáveis)
-                    elif (i,j) not in self.game.hidden_cells:
-                        color = (255, 255, 255)  # Branco para fixos
-                    # Células editáveis pelo jogador
-                    else:
-                        # Verifica se o número está correto
-                        is_correct = (num == self.game.solution[i][j])
-                        color = (100, 100, 255) if is_correct else (255, 100, 100)
-                    
-                    # Renderiza o número
-                    text = self.font.render(str(num), True, color)
-                    text_rect = text.get_rect(
-                        center=(
-                            self.grid_pos[0] + j * self.cell_size + self.cell_size // 2,
-                            self.grid_pos[1] + i * self.cell_size + self.cell_size // 2
-                        )
-                    )
-                    self.screen.blit(text, text_rect)
-                    
-    def draw_selection(self):
-        """Destaca a célula selecionada"""
-        if hasattr(self, 'selected') and self.selected:
-            row, col = self.selected
-            pygame.draw.rect(
-                self.screen, self.colors['selected'],
-                (
-                    self.grid_pos[0] + col * self.cell_size,
-                    self.grid_pos[1] + row * self.cell_size,
-                    self.cell_size, self.cell_size
-                ),
-                3
-            )
+    def draw_cell(self, rect, state, _):
+        """Desenha o número e o destaque (seleção, solver ou dica) de uma célula"""
+        symbol, color, border = state
+        if symbol:
+            text = TEXT_CACHE.render(self.font, symbol, color)
+            self.screen.blit(text, text.get_rect(center=rect.center))
+        if border:
+            pygame.draw.rect(self.screen, border, rect, 3)
     
-    def draw_lives(self):
-        """Desenha os corações de vida com título"""
-        # Título "VIDAS"
-        title = self.small_font.render("VIDAS:", True, self.colors['title'])
-        self.screen.blit(title, (20, 15))
-        
-        # Corações
-        for i in range(self.lives):
+    def draw_scrub_bar(self, rect, width, _):
+        """Barra de progresso da reprodução; clicar ou arrastar salta de passo"""
+        done = rect.copy()
+        done.width = width
+        pygame.draw.rect(self.screen, self.colors['speed_button'], rect, border_radius=3)
+        pygame.draw.rect(self.screen, self.colors['speed_button_active'], done, border_radius=3)
+    
+    def draw_lives(self, rect, lives, _):
+        """Desenha os corações de vida (o título "VIDAS:" está no fundo)"""
+        for i in range(lives):
             self.screen.blit(
                 self.heart_img,
                 (100 + i * 40, 20)
             )
     
-    def draw_buttons(self):
-        """Desenha os controles"""
-        mouse_pos = pygame.mouse.get_pos()
-        
-        # Botão RESOLVER
-        btn_color = self.colors['button_hover'] if self.solve_button.collidepoint(mouse_pos) else self.colors['button']
-        pygame.draw.rect(self.screen, btn_color, self.solve_button, border_radius=5)
-        text = self.small_font.render("RESOLVER", True, (255, 255, 255))
-        text_rect = text.get_rect(center=self.solve_button.center)
-        self.screen.blit(text, text_rect)
-        
-        # Botão DICA
-        hint_color = self.colors['hint_button_hover'] if self.hint_button.collidepoint(mouse_pos) else self.colors['hint_button']
-        pygame.draw.rect(self.screen, hint_color, self.hint_button, border_radius=5)
-        hint_text = self.small_font.render(f"DICA ({self.hints_left})", True, (255, 255, 255))
-        hint_rect = hint_text.get_rect(center=self.hint_button.center)
-        self.screen.blit(hint_text, hint_rect)
-        
-        # Botões de velocidade
-        for speed, rect in self.speed_buttons.items():
-            active = self.speed == {'lento': 400, 'normal': 200, 'rápido': 50}[speed]
-            btn_color = self.colors['speed_button_active'] if active else (
-                self.colors['speed_button_hover'] if rect.collidepoint(mouse_pos) else self.colors['speed_button']
-            )
-            pygame.draw.rect(self.screen, btn_color, rect, border_radius=3)
-            text = self.small_font.render(speed.upper(), True, (255, 255, 255))
-            text_rect = text.get_rect(center=rect.center)
-            self.screen.blit(text, text_rect)
-        
-        # Exibe explicação do passo atual
-        if hasattr(self, 'current_step'):
-            step_text = self.small_font.render(self.current_step, True, (200, 200, 200))
-            self.screen.blit(step_text, (20, 550))
+    def draw_button(self, rect, state, radius, surface=None):
+        """
+        Desenha um botão (RESOLVER, DICA, velocidade ou controle da reprodução)
+        Com cor None só o rótulo é desenhado, sobre o fundo já pré-composto
+        """
+        surface = surface or self.screen
+        label, btn_color = state
+        if btn_color is not None:
+            pygame.draw.rect(surface, btn_color, rect, border_radius=radius)
+        text = TEXT_CACHE.render(self.small_font, label, (255, 255, 255))
+        surface.blit(text, text.get_rect(center=rect.center))
+    
+    def draw_profiler(self, rect, _, __):
+        """HUD do perfil de quadros (F3)"""
+        self.profiler.draw(self.screen, rect, self.hud_font)
+    
+    def draw_step_text(self, rect, message, _):
+        """Exibe explicação do passo atual"""
+        step_text = TEXT_CACHE.render(self.small_font, message, (200, 200, 200))
+        self.screen.blit(step_text, rect.topleft)
     
     def handle_hint_click(self):
         """Fornece uma dica ao jogador"""
         if self.hints_left <= 0:
             return
             
-        # Cria novo solver com estado atual do tabuleiro
-        self.solver = SudokuSolver(self.game.board.copy())
-        hint = self.solver.get_hint()
+        # Dica vem do grid de candidatos mantido pelo jogo
+        hint = self.game.get_hint()
         
         if hint:
             row, col, num = hint
             # Verifica se a célula ainda está vazia
             if self.game.board[row][col] == 0:
-                self.game.board[row][col] = num
+                self.game.place(row, col, num)
                 self.hints_left -= 1
                 
-                # Destaca a dica
-                self.draw()
-                pygame.draw.rect(
-                    self.screen, (0, 200, 200),
-                    (
-                        self.grid_pos[0] + col * self.cell_size,
-                        self.grid_pos[1] + row * self.cell_size,
-                        self.cell_size, self.cell_size
-                    ),
-                    3
-                )
-                
-                # Mostra número da dica
-                hint_text = self.font.render(str(num), True, (0, 200, 200))
-                text_rect = hint_text.get_rect(
-                    center=(
-                        self.grid_pos[0] + col * self.cell_size + self.cell_size//2,
-                        self.grid_pos[1] + row * self.cell_size + self.cell_size//2
-                    )
-                )
-                self.screen.blit(hint_text, text_rect)
-                
-                pygame.display.flip()
-                pygame.time.delay(1500)
-            else:
-                # Se a célula já foi preenchida, tenta novamente
-                self.handle_hint_click()
+                # Destaca a dica (em ciano) por 1,5 s sem travar o jogo
+                self.hint_cell = (row, col)
+                self.hint_until = pygame.time.get_ticks() + 1500
+                self.autosave()
     
     def handle_click(self, pos):
         """Processa clique do mouse"""
-        if self.hint_button.collidepoint(pos):
+        # Enquanto o trace é gravado o tabuleiro não pode mudar
+        if self.recorder is not None:
+            return
+        
+        # Durante a resolução só valem os controles do solver e a velocidade
+        if self.solving:
+            actions = {
+                'pausar': self.toggle_solver_pause,
+                'passo': self.step_solver,
+                'voltar': self.toggle_solver_direction,
+                'parar': self.cancel_solver
+            }
+            for name, rect in self.solve_controls.items():
+                if rect.collidepoint(pos):
+                    actions[name]()
+                    return
+            if self.scrub_bar.inflate(0, 10).collidepoint(pos):
+                self.seek_solver(pos[0])
+                return
+        
+        if self.hint_button.collidepoint(pos) and not self.solving:
             self.handle_hint_click()
             return
             
@@ -235,6 +460,8 @@ class GameScreen:
         
         # Clique no tabuleiro...
         x, y = pos
+        if self.solving:
+            return
         if (self.grid_pos[0] <= x < self.grid_pos[0] + self.grid_size and
             self.grid_pos[1] <= y < self.grid_pos[1] + self.grid_size):
             
@@ -249,65 +476,167 @@ class GameScreen:
             self.selected = None
     
     def run_solver(self):
-        """Executa o solver"""
-        self.solver = SudokuSolver(self.game.board.copy())
+        """
+        Grava o trace da resolução alguns ms por quadro e depois o reproduz aos
+        poucos pelo loop principal (update_solver), com pausa e rebobinagem
+        """
+        if self.player is not None or self.recorder is not None:
+            return
+        
+        # O mesmo tabuleiro resolvido de novo (ex.: RESOLVER depois de cancelar) vem do cache
+        self.solve_givens = self.game.board.copy()
+        self.selected = None
+        self.solve_key = trace_key(self.game.board, self.solver_backend, self.solver_budget)
+        # Acontece dentro do tratamento do clique; no perfil conta como "solver"
+        with self.profiler.phase("solver"):
+            trace = SOLVE_CACHE.get(self.solve_key)
+            if trace is None:
+                solver = SudokuSolver(self.game.board.copy(), self.solver_backend)
+                self.recorder = TraceRecorder(solver, self.solver_budget)
+                self.current_step = "Resolvendo..."
+                return
+        self.start_playback(trace)
+    
+    def record_solver(self):
+        """Grava mais uma fatia do trace; no fim, guarda no cache e começa a reprodução"""
+        if not self.recorder.advance(SOLVER_RECORD_SLICE / 1000):
+            return
+        trace = self.recorder.trace()
+        self.recorder = None
+        SOLVE_CACHE.put(self.solve_key, trace, trace.nbytes)
+        self.start_playback(trace)
+    
+    def start_playback(self, trace):
+        self.player = TracePlayer(trace)
+        self.solving = True
+        self.solve_paused = False
+        self.solve_direction = 1
+        self.solve_debt = 0
+    
+    def update_solver(self, dt):
+        """Grava o trace pendente ou reproduz os passos que cabem nos `dt` ms deste quadro"""
+        if self.recorder is not None:
+            self.record_solver()
+            return
+        
+        if self.player is None:
+            # Apaga a mensagem final depois de alguns segundos
+            if self.current_step and pygame.time.get_ticks() >= self.message_until:
+                self.current_step = ""
+            return
+        
+        if self.solve_paused:
+            return
         
-        def update_cell(row, col, num, is_backtrack):
-            # Atualiza explicação do passo
-            if is_backtrack:
-                self.current_step = f"Backtrack: removendo {num} de ({row+1},{col+1})"
+        # Cada passo "custa" a velocidade escolhida em ms (backtrack, metade)
+        self.solve_debt += dt
+        while self.solve_debt > 0 and self.advance_solver(self.solve_direction):
+            pass
+    
+    def advance_solver(self, direction=1):
+        """Avança (ou volta) um passo do trace; False no fim ou no início"""
+        event = self.player.forward() if direction > 0 else self.player.backward()
+        if event is None:
+            if direction > 0:
+                self.finish_solver(self.player.trace.result)
             else:
-                self.current_step = f"Testando {num} em ({row+1},{col+1})"
-            
-            # Atualiza visualização
-            color = (255, 100, 100) if is_backtrack else (100, 255, 100)
-            self.game.board[row][col] = num
-            self.draw()
-            
-            # Destaca célula atual
-            pygame.draw.rect(
-                self.screen, color,
-                (
-                    self.grid_pos[0] + col * self.cell_size,
-                    self.grid_pos[1] + row * self.cell_size,
-                    self.cell_size, self.cell_size
-                ),
-                3
-            )
-            pygame.display.flip()
-            
-            # Delay
-            pygame.time.delay(self.speed // 2 if is_backtrack else self.speed)
-            
-            return True
-            
-        # Executa a solução
-        success = self.solver.solve_visually(update_cell)
+                self.solve_paused = True
+            return False
+        
+        row, col, num, is_backtrack = event
+        
+        # Atualiza explicação do passo
+        if direction < 0:
+            self.current_step = f"Voltando ao passo {self.player.position}"
+        elif is_backtrack:
+            self.current_step = f"Backtrack: removendo {SYMBOLS[self.game.board[row][col] - 1]} de ({row+1},{col+1})"
+        else:
+            self.current_step = f"Testando {SYMBOLS[num - 1]} em ({row+1},{col+1})"
         
+        self.game.board[row][col] = self.player.board[row][col]
+        self.solve_cell = (row, col, is_backtrack)
+        self.solve_debt -= self.speed // 2 if is_backtrack else self.speed
+        return True
+    
+    def toggle_solver_pause(self):
+        self.solve_paused = not self.solve_paused
+        if not self.solve_paused and self.solve_direction < 0 and self.player.position == 0:
+            self.solve_direction = 1  # No início, continuar só faz sentido para frente
+    
+    def toggle_solver_direction(self):
+        """Alterna entre reproduzir para frente e para trás"""
+        self.solve_direction = -self.solve_direction
+        self.solve_paused = False
+    
+    def step_solver(self, direction=1):
+        """Pausa a reprodução e anda um único passo"""
+        self.solve_paused = True
+        self.advance_solver(direction)
+    
+    def seek_solver(self, x):
+        """Salta para o passo correspondente à posição x da barra de progresso"""
+        fraction = (x - self.scrub_bar.x) / self.scrub_bar.width
+        k = round(max(0.0, min(1.0, fraction)) * len(self.player.trace))
+        self.player.seek(k)
+        self.game.board[:] = self.player.board
+        self.solve_cell = None
+        self.solve_paused = True
+        self.current_step = f"Passo {self.player.position} de {len(self.player.trace)}"
+    
+    def cancel_solver(self):
+        """Interrompe a reprodução e devolve o tabuleiro ao estado anterior"""
+        self.finish_solver(STOPPED)
+    
+    def finish_solver(self, result):
+        """Encerra a resolução e mostra o resultado"""
         # Feedback final
-        if success:
+        if result == SOLVED:
             self.current_step = "Sudoku resolvido com sucesso!"
-            self.game.board = self.solver.board
+            self.game.board = self.player.trace.board_at(len(self.player.trace)).astype(int)
+            self.finished = True
         else:
-            self.current_step = "Não foi possível encontrar solução!"
-        
-        self.draw()
-        pygame.time.delay(2000)
+            self.current_step = {
+                EXHAUSTED: "Limite de passos atingido!",
+                STOPPED: "Resolução cancelada"
+            }.get(result, "Não foi possível encontrar solução!")
+            self.game.board = self.solve_givens
+        self.game.rebuild_state()
         
         # Reseta estado
-        self.current_step = ""
+        self.player = None
+        self.solve_cell = None
+        self.solving = False
+        self.message_until = pygame.time.get_ticks() + 2000
     
     def handle_key(self, key):
         """Processa teclas pressionadas"""
-        if not hasattr(self, 'selected') or not self.selected:
+        if self.recorder is not None:
+            return
+        
+        # Espaço pausa/continua a reprodução, N/→ avança e ← volta um passo
+        if self.solving:
+            if key == pygame.K_SPACE:
+                self.toggle_solver_pause()
+            elif key in (pygame.K_n, pygame.K_RIGHT):
+                self.step_solver()
+            elif key == pygame.K_LEFT:
+                self.step_solver(-1)
+            return
+        
+        if not self.selected:
             return
         
         row, col = self.selected
         
-        # Números de 1-9
+        # Números de 1-9 e, nos tabuleiros maiores, letras A.. para 10 em diante
+        num = None
         if pygame.K_1 <= key <= pygame.K_9:
             num = key - pygame.K_0
-            self.game.board[row][col] = num
+        elif pygame.K_a <= key <= pygame.K_z and key - pygame.K_a + 10 <= self.side:
+            num = key - pygame.K_a + 10
+        
+        if num:
+            self.game.place(row, col, num)
             
             # Verifica se está correto
             if num != self.game.solution[row][col]:
@@ -318,10 +647,12 @@ class GameScreen:
                 self.game.hidden_cells.remove((row, col))
                 if not self.game.hidden_cells:
                     self.victory()
+            self.autosave()
         
         # Backspace ou delete para apagar
         elif key in (pygame.K_BACKSPACE, pygame.K_DELETE):
-            self.game.board[row][col] = 0
+            self.game.erase(row, col)
+            self.autosave()
     
     def show_end_screen(self, victory):
         """Mostra tela de vitória/derrota"""
@@ -330,11 +661,11 @@ class GameScreen:
         self.screen.blit(overlay, (0, 0))
         
         if victory:
-            title = self.font.render("VITÓRIA!", True, (0, 255, 0))
-            subtitle = self.small_font.render("Parabéns, você completou o Sudoku!", True, (255, 255, 255))
+            title = TEXT_CACHE.render(self.font, "VITÓRIA!", (0, 255, 0))
+            subtitle = TEXT_CACHE.render(self.small_font, "Parabéns, você completou o Sudoku!", (255, 255, 255))
         else:
-            title = self.font.render("GAME OVER", True, (255, 0, 0))
-            subtitle = self.small_font.render("Tente novamente!", True, (255, 255, 255))
+            title = TEXT_CACHE.render(self.font, "GAME OVER", (255, 0, 0))
+            subtitle = TEXT_CACHE.render(self.small_font, "Tente novamente!", (255, 255, 255))
         
         # Centraliza os textos
         title_rect = title.get_rect(center=(400, 250))
@@ -344,47 +675,78 @@ class GameScreen:
         self.screen.blit(subtitle, subtitle_rect)
         
         # Instrução para continuar
-        instruction = self.small_font.render("Pressione qualquer tecla para voltar", True, (200, 200, 200))
+        instruction = TEXT_CACHE.render(self.small_font, "Pressione qualquer tecla para voltar", (200, 200, 200))
         instruction_rect = instruction.get_rect(center=(400, 350))
         self.screen.blit(instruction, instruction_rect)
         
         pygame.display.flip()
+        self.invalidate()  # O overlay cobriu a tela inteira
         
-        # Espera por qualquer tecla
-        waiting = True
-        while waiting:
-            for event in pygame.event.get():
-                if event.type == QUIT:
-                    pygame.quit()
-                    return
-                elif event.type == KEYDOWN:
-                    waiting = False
+        # Espera por qualquer tecla, dormindo até o próximo evento
+        while True:
+            event = pygame.event.wait()
+            if event.type == QUIT:
+                pygame.quit()
+                return
+            elif event.type == KEYDOWN:
+                return
     
     def game_over(self):
         """Finaliza o jogo quando perde"""
+        self.finished = True
         self.show_end_screen(False)
         self.running = False
     
     def victory(self):
         """Finaliza o jogo quando vence"""
+        self.finished = True
         self.show_end_screen(True)
         self.running = False
     
+    def handle_event(self, event):
+        """Trata um evento; retorna "sair" quando o jogo termina"""
+        if event.type == QUIT:
+            self.running = False
+        elif event.type == MOUSEBUTTONDOWN:
+            self.handle_click(event.pos)
+        elif event.type == MOUSEMOTION and event.buttons[0] and self.solving:
+            # Arrastar na barra de progresso salta pelo trace
+            if self.scrub_bar.inflate(0, 10).collidepoint(event.pos):
+                self.seek_solver(event.pos[0])
+        elif event.type == KEYDOWN:
+            if event.key == K_F3:
+                self.profiler.toggle()
+            elif event.key == K_ESCAPE:
+                # ESC primeiro cancela a resolução, depois sai do jogo
+                if self.solving:
+                    self.cancel_solver()
+                else:
+                    self.running = False
+            else:
+                self.handle_key(event.key)
+        return None if self.running else "sair"
+    
+    def update(self, dt):
+        self.update_solver(dt)
+    
+    def is_animating(self):
+        """Gravação ou reprodução rodando, destaque da dica ou mensagem com prazo para sumir"""
+        if self.recorder is not None:
+            return True
+        if self.player is not None:
+            return not self.solve_paused
+        return pygame.time.get_ticks() < self.hint_until or bool(self.current_step)
+    
     def run(self):
         """Loop principal do jogo"""
         self.running = True
+        self.invalidate()
+        self.loop.run(self)
+        self.profiler.close()
         
-        while self.running:
-            for event in pygame.event.get():
-                if event.type == QUIT:
-                    self.running = False
-                elif event.type == MOUSEBUTTONDOWN:
-                    self.handle_click(event.pos)
-                elif event.type == KEYDOWN:
-                    if event.key == K_ESCAPE:
-                        self.running = False
-                    else:
-                        self.handle_key(event.key)
-            
-            self.draw()
-            pygame.time.Clock().tick(60)
+        # Ao sair no meio da partida ela fica salva; terminada, não há o que retomar
+        if self.finished:
+            self.autosaver.discard()
+        else:
+            self.autosave()
+        self.autosaver.stop()
@@ -0,0 +1,82 @@
+import time
+import pygame
+from .settings import FPS, IDLE_TIMEOUT
+from .profiler import DISABLED
+
+
+class LoopRunner:
+    """
+    Loop principal compartilhado pelas telas. Enquanto a tela anima, roda a
+    FPS quadros por segundo; parada, dorme em pygame.event.wait até chegar um
+    evento (ou IDLE_TIMEOUT ms), sem gastar CPU esperando o jogador.
+
+    A tela precisa de:
+      handle_event(event) -> valor que encerra o loop, ou None
+      update(dt)          -> idem; dt em ms desde o último quadro
+      draw()
+      is_animating()      -> True se algo muda com o tempo, sem eventos
+
+    Com um FrameProfiler, eventos e update entram nas fases "eventos" e
+    "solver" e cada volta do loop fecha um quadro do perfil.
+    """
+
+    def __init__(self, fps=FPS, idle_timeout=IDLE_TIMEOUT, profiler=None):
+        self.fps = fps
+        self.idle_timeout = idle_timeout
+        self.profiler = profiler or DISABLED
+        self.clock = pygame.time.Clock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.frames = 0
+        self.wakeups = 0  # Retornos do event.wait (evento ou timeout)
+        self.started = time.perf_counter()
+        self.cpu_started = time.process_time()
+
+    def run(self, screen):
+        """Roda a tela até handle_event ou update retornar algo diferente de None"""
+        self.reset_stats()
+        self.clock.tick()
+        frame_ms = 1000 // self.fps
+        was_animating = True
+
+        while True:
+            # Um quadro a mais quando a animação acaba, para desenhar o estado final
+            animating = screen.is_animating()
+            if animating or was_animating:
+                dt = self.clock.tick(self.fps)
+                events = pygame.event.get()
+            else:
+                event = pygame.event.wait(self.idle_timeout)
+                self.wakeups += 1
+                events = [event] + pygame.event.get() if event.type != pygame.NOEVENT else []
+                # O tempo parado não conta: a animação retoma de onde estava
+                dt = min(self.clock.tick(), frame_ms)
+            was_animating = animating
+
+            profiler = self.profiler
+            profiler.start_frame()
+            with profiler.phase("eventos"):
+                for event in events:
+                    result = screen.handle_event(event)
+                    if result is not None:
+                        return result
+
+            with profiler.phase("solver"):
+                result = screen.update(dt)
+            if result is not None:
+                return result
+            screen.draw()
+            profiler.end_frame()
+            self.frames += 1
+
+    def stats(self):
+        """Quadros, despertares e uso de CPU (% de um núcleo) desde o início do run()"""
+        wall = time.perf_counter() - self.started
+        cpu = time.process_time() - self.cpu_started
+        return {
+            "frames": self.frames,
+            "wakeups": self.wakeups,
+            "seconds": round(wall, 1),
+            "cpu_percent": round(100 * cpu / wall, 1) if wall else 0.0,
+        }
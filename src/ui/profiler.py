@@ -0,0 +1,179 @@
+import csv
+import os
+import time
+from collections import deque
+from contextlib import nullcontext
+import numpy as np
+import pygame
+from .settings import PROFILER_WINDOW
+
+# Fases medidas em cada quadro, na ordem das colunas do CSV
+PHASES = ["eventos", "solver", "estado", "fundo", "células", "vidas", "botões", "hud", "flip"]
+
+# Faixas do histograma de tempo de quadro (ms)
+HISTOGRAM_BINS = [0, 1, 2, 4, 8, 16, float("inf")]
+
+_NULL_PHASE = nullcontext()
+
+
+class FrameProfiler:
+    """
+    Mede o tempo de cada fase do quadro (eventos, solver e as partes do draw)
+    e mostra percentis e um histograma dos últimos quadros num HUD.
+
+    Ligado pela tecla F3 ou pela variável de ambiente SUDOKU_PROFILE=1;
+    SUDOKU_PROFILE_CSV=<arquivo> grava também uma linha por quadro em CSV.
+    Fases podem ser aninhadas: o tempo de uma fase interna não é somado à
+    externa, então a soma das fases continua batendo com o total do quadro.
+    Desligado, phase() devolve um contexto vazio e o custo é desprezível.
+    """
+
+    def __init__(self, enabled=None, csv_path=None, window=PROFILER_WINDOW):
+        if enabled is None:
+            enabled = os.environ.get("SUDOKU_PROFILE", "") not in ("", "0")
+        if csv_path is None:
+            csv_path = os.environ.get("SUDOKU_PROFILE_CSV") or None
+        self.enabled = enabled
+        self.history = deque(maxlen=window)  # (total, *fases) em ms
+        self.frames = 0
+        self.current = dict.fromkeys(PHASES, 0.0)
+        self.frame_start = None
+        self.stack = []  # Fases abertas, a mais interna no fim
+        self.phase_start = 0.0
+
+        self.csv_file = self.csv_writer = None
+        if csv_path:
+            # Acrescenta ao arquivo: várias partidas podem gravar no mesmo CSV
+            self.csv_file = open(csv_path, "a", newline="")
+            self.csv_writer = csv.writer(self.csv_file)
+            if self.csv_file.tell() == 0:
+                self.csv_writer.writerow(["quadro", "total_ms"] + [f"{name}_ms" for name in PHASES])
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.current = dict.fromkeys(PHASES, 0.0)
+        self.frame_start = None
+
+    def phase(self, name):
+        """Contexto que soma o tempo gasto dentro dele à fase `name` do quadro"""
+        if not self.enabled:
+            return _NULL_PHASE
+        return _Phase(self, name)
+
+    def charge(self):
+        """Soma à fase mais interna o tempo desde a última troca de fase"""
+        now = time.perf_counter()
+        if self.stack:
+            self.current[self.stack[-1]] += (now - self.phase_start) * 1000
+        self.phase_start = now
+
+    def enter(self, name):
+        self.charge()
+        self.stack.append(name)
+
+    def exit(self):
+        self.charge()
+        if self.stack:  # Vazia se o perfil foi ligado (F3) dentro da fase
+            self.stack.pop()
+
+    def start_frame(self):
+        if self.enabled:
+            self.frame_start = time.perf_counter()
+
+    def end_frame(self):
+        """Fecha o quadro: guarda no histórico e, se pedido, no CSV"""
+        if not self.enabled or self.frame_start is None:
+            return
+        total = (time.perf_counter() - self.frame_start) * 1000
+        row = [total] + [self.current[name] for name in PHASES]
+        self.history.append(row)
+        self.frames += 1
+        if self.csv_writer:
+            self.csv_writer.writerow([self.frames] + [f"{value:.3f}" for value in row])
+        self.current = dict.fromkeys(PHASES, 0.0)
+        self.frame_start = None
+
+    def percentiles(self, q=(50, 95, 99)):
+        """Percentis (ms) do total e de cada fase: {nome: [p50, p95, p99]}"""
+        data = np.array(self.history)
+        return {
+            name: np.percentile(data[:, k], q).tolist()
+            for k, name in enumerate(["quadro"] + PHASES)
+        }
+
+    def histogram(self):
+        """Quadros por faixa de HISTOGRAM_BINS"""
+        totals = [row[0] for row in self.history]
+        return np.histogram(totals, bins=HISTOGRAM_BINS)[0].tolist()
+
+    def draw(self, surface, rect, font):
+        """HUD: percentis do quadro, p50/p95 de cada fase e o histograma"""
+        pygame.draw.rect(surface, (0, 0, 0), rect)
+        line_height = font.get_linesize() + 2
+        x, y = rect.x + 4, rect.y + 4
+
+        def line(text, color=(200, 200, 200)):
+            nonlocal y
+            surface.blit(font.render(text, False, color), (x, y))
+            y += line_height
+
+        line("PERFIL (F3)", (255, 215, 0))
+        if not self.history:
+            line("sem quadros")
+            return
+
+        stats = self.percentiles()
+        p50, p95, p99 = stats["quadro"]
+        line(f"quadro {len(self.history)}")
+        line(f"p50 {ms(p50)}")
+        line(f"p95 {ms(p95)}")
+        line(f"p99 {ms(p99)}")
+        y += line_height // 2
+        line("fase    p50  p95", (255, 215, 0))
+        for name in PHASES:
+            p50, p95, _ = stats[name]
+            line(f"{name[:6]:<6} {ms(p50)} {ms(p95)}")
+
+        # Histograma: uma barra por faixa, proporcional ao número de quadros
+        y += line_height // 2
+        line("histograma ms", (255, 215, 0))
+        counts = self.histogram()
+        bar_width = rect.right - x - 36
+        for low, count in zip(HISTOGRAM_BINS, counts):
+            line(f"{low:>2}+")
+            bar = pygame.Rect(x + 30, y - line_height, bar_width * count // max(counts), line_height - 3)
+            pygame.draw.rect(surface, (100, 100, 150), bar)
+
+    def close(self):
+        if self.csv_file:
+            self.csv_file.close()
+            self.csv_file = self.csv_writer = None
+
+
+class _Phase:
+    """Contexto de uma chamada a FrameProfiler.phase"""
+
+    __slots__ = ("profiler", "name")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.profiler.enter(self.name)
+
+    def __exit__(self, *exc):
+        self.profiler.exit()
+
+
+def ms(value):
+    """Milissegundos em 4 caracteres (0.12, 12.3, 123)"""
+    if value < 10:
+        return f"{value:4.2f}"
+    if value < 100:
+        return f"{value:4.1f}"
+    return f"{value:4.0f}"
+
+
+# Perfil sempre desligado, para loops sem instrumentação
+DISABLED = FrameProfiler(enabled=False, csv_path="")
@@ -16,13 +16,38 @@ FONT_SIZE = 16
 FONT_SIZE_SMALL = 12
 FONT_FALLBACK = "Arial"
 
+# Imagens
+HEART_IMAGE = "assets/images/heart.png"
+
+# Textos renderizados mantidos em cache (descarte LRU acima disso)
+TEXT_CACHE_SIZE = 512
+
 # Configurações de animação
+FPS = 60              # Quadros por segundo enquanto algo anima
+IDLE_TIMEOUT = 500    # ms máximos dormindo em event.wait quando nada anima
+PROFILER_WINDOW = 240 # Quadros considerados nos percentis do perfil (F3)
 FADE_SPEED = 5
 GLITCH_DURATION = 200  # ms
+GLITCH_FRAMES = 4      # Variações do glitch pré-calculadas por texto
+SOLVER_RECORD_SLICE = 8  # ms por quadro gravando o trace do RESOLVER
 
 # Dificuldades
 DIFFICULTIES = ["FÁCIL", "MÉDIO", "DIFÍCIL"]
 
+# Ordem do tabuleiro: 3 -> 9x9, 4 -> 16x16, 5 -> 25x25
+# (pool e banco de puzzles só existem para 9x9)
+BOARD_ORDER = 3
+
+# Pool de puzzles pré-gerados (por dificuldade)
+POOL_SIZE = 5
+POOL_LOW_WATERMARK = 4  # Repõe quando sobrar esta quantidade ou menos
+
+# Banco de puzzles pré-gerado (generate_bank.py); usado no lugar do pool se existir
+BANK_PATH = "puzzles.bank"
+
+# Partida em andamento, salva a cada jogada e retomada por CONTINUAR no menu
+SAVE_PATH = "savegame.bin"
+
 # Informações sobre o jogo
 ABOUT_INFO = {
     "title": "SOBRE O JOGO",
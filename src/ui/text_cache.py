@@ -0,0 +1,44 @@
+from collections import OrderedDict
+from .settings import TEXT_CACHE_SIZE
+
+
+class TextCache:
+    """
+    Textos já renderizados, por (fonte, texto, cor), com descarte LRU.
+    As superfícies são compartilhadas: quem precisar alterá-las deve copiar antes.
+    """
+
+    def __init__(self, max_size=TEXT_CACHE_SIZE):
+        self.max_size = max_size
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, antialias=True):
+        """Mesmo que font.render, mas só rasteriza na primeira vez"""
+        key = (font, text, tuple(color), antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def prebake(self, font, texts, colors):
+        """Renderiza de antemão todas as combinações de textos e cores"""
+        for text in texts:
+            for color in colors:
+                self.render(font, text, color)
+
+    def stats(self):
+        return {"size": len(self.surfaces), "hits": self.hits, "misses": self.misses}
+
+
+# Cache único compartilhado por todas as telas
+TEXT_CACHE = TextCache()
@@ -0,0 +1,241 @@
+import random
+import sys
+import pygame
+from .settings import FADE_SPEED, GLITCH_DURATION, GLITCH_FRAMES
+from .text_cache import TEXT_CACHE
+from .loop import LoopRunner
+
+
+def draw_pixel_border(surface, rect, color, thickness=2):
+    """Desenha borda pixelada (cada camada um pixel para fora)"""
+    for offset in range(thickness):
+        points = [
+            (rect.left-offset, rect.top-offset),
+            (rect.right+offset-1, rect.top-offset),
+            (rect.right+offset-1, rect.bottom+offset-1),
+            (rect.left-offset, rect.bottom+offset-1)
+        ]
+        pygame.draw.lines(surface, color, True, points, 1)
+
+
+def make_glitch_frames(surface, count=GLITCH_FRAMES):
+    """Cópias de `surface` com riscos pretos aleatórios, calculadas uma vez só"""
+    frames = []
+    for _ in range(count):
+        frame = surface.copy()
+        for _ in range(5):
+            x = random.randint(0, frame.get_width()//2)
+            y = random.randint(0, frame.get_height())
+            w = random.randint(1, 10)
+            h = random.randint(1, 3)
+            pygame.draw.rect(frame, (0, 0, 0), (x, y, w, h))
+        frames.append(frame)
+    return frames
+
+
+class FadeOverlay:
+    """Véu preto de tela cheia reaproveitado em todos os fades (muda só o alpha)"""
+
+    def __init__(self, size):
+        self.surface = pygame.Surface(size)
+        self.surface.fill((0, 0, 0))
+
+    def draw(self, target, alpha):
+        self.surface.set_alpha(alpha)
+        target.blit(self.surface, (0, 0))
+
+
+class Label:
+    """Texto centrado num ponto; rasterizado só quando a cor muda"""
+
+    def __init__(self, font, text, color, center, glitchy=False):
+        self.font = font
+        self.text = text
+        self.center = center
+        self.glitchy = glitchy
+        self.color = None
+        self.set_color(color)
+
+    def set_color(self, color):
+        if color == self.color:
+            return
+        self.color = color
+        self.surface = TEXT_CACHE.render(self.font, self.text, color)
+        self.rect = self.surface.get_rect(center=self.center)
+        self.glitch_frames = None  # Refeitos sob demanda para a nova cor
+
+    @property
+    def state(self):
+        return tuple(self.color)
+
+    def image(self, glitch=None):
+        """Superfície do texto, ou o quadro de glitch de índice `glitch`"""
+        if glitch is None or not self.glitchy:
+            return self.surface
+        if self.glitch_frames is None:
+            self.glitch_frames = make_glitch_frames(self.surface)
+        return self.glitch_frames[glitch]
+
+    def draw(self, surface, glitch=None):
+        surface.blit(self.image(glitch), self.rect)
+
+
+class Button:
+    """
+    Opção de menu: caixa com borda pixelada e rótulo. Cada estado
+    (selecionado ou não, quadro de glitch) é composto uma vez e reaproveitado.
+    """
+
+    MARGIN = 2  # A borda mais grossa (3) sai 2 pixels para fora da caixa
+
+    def __init__(self, font, text, center, colors):
+        # colors: 'text', 'selected', 'box', 'border' e 'bg' (fundo em volta da borda)
+        self.colors = colors
+        self.labels = {
+            False: Label(font, text, colors['text'], center),
+            True: Label(font, text, colors['selected'], center, glitchy=True),
+        }
+        self.box = self.labels[False].rect.inflate(40, 20)
+        self.rect = self.box.inflate(2 * self.MARGIN, 2 * self.MARGIN)
+        self.selected = False
+        self.images = {}
+
+    @property
+    def state(self):
+        return self.selected
+
+    def compose(self, glitch):
+        image = pygame.Surface(self.rect.size).convert()
+        image.fill(self.colors['bg'])
+        box = self.box.move(-self.rect.x, -self.rect.y)
+        pygame.draw.rect(image, self.colors['box'], box)
+        draw_pixel_border(image, box, self.colors['border'], 3 if self.selected else 2)
+        label = self.labels[self.selected]
+        image.blit(label.image(glitch), label.rect.move(-self.rect.x, -self.rect.y))
+        return image
+
+    def draw(self, surface, glitch=None):
+        key = (self.selected, glitch if self.selected else None)
+        image = self.images.get(key)
+        if image is None:
+            image = self.images[key] = self.compose(key[1])
+        surface.blit(image, self.rect)
+
+
+class WidgetScreen:
+    """
+    Base dos menus e da tela SOBRE: uma lista de widgets retidos, fade de
+    entrada e efeito glitch. A tela só é redesenhada quando o estado de algum
+    widget, o alpha do fade ou o quadro de glitch muda.
+
+    Subclasses montam self.widgets e estendem handle_event(event).
+    """
+
+    def __init__(self, screen, bg_color):
+        self.screen = screen
+        self.bg_color = bg_color
+        self.widgets = []
+        self.overlay = FadeOverlay(screen.get_size())
+        self.loop = LoopRunner()
+
+        # Efeitos de animação
+        self.alpha = 0
+        self.fade_in = True
+        self.glitch_effect = False
+        self.glitch_timer = 0
+        self.glitch_frame = None
+        self.drawn_state = None
+
+    def start(self):
+        """Prepara o fade de entrada e força o primeiro desenho"""
+        self.fade_in = True
+        self.alpha = 0
+        self.drawn_state = None
+
+    def handle_event(self, event):
+        """Fechar a janela sai do jogo; uma exposição da janela força o redesenho"""
+        if event.type == pygame.QUIT:
+            pygame.quit()
+            sys.exit()
+        if event.type == pygame.VIDEOEXPOSE:
+            self.drawn_state = None
+        return None
+
+    def start_glitch(self):
+        self.glitch_effect = True
+        self.glitch_timer = pygame.time.get_ticks()
+
+    def update(self, dt):
+        # Fade de entrada: FADE_SPEED de alpha por quadro
+        if self.fade_in and self.alpha < 255:
+            self.alpha = min(255, self.alpha + FADE_SPEED)
+
+        # Controla duração do efeito glitch e sorteia o quadro da vez
+        if self.glitch_effect and pygame.time.get_ticks() - self.glitch_timer > GLITCH_DURATION:
+            self.glitch_effect = False
+        self.glitch_frame = random.randrange(GLITCH_FRAMES) if self.glitch_effect else None
+
+    def is_animating(self):
+        """Fade de entrada ou glitch em andamento"""
+        return (self.fade_in and self.alpha < 255) or self.glitch_effect
+
+    def compose(self):
+        """Pinta fundo e widgets na tela, sem enviar ao display"""
+        self.screen.fill(self.bg_color)
+        for widget in self.widgets:
+            widget.draw(self.screen, self.glitch_frame)
+        if self.fade_in and self.alpha < 255:
+            self.overlay.draw(self.screen, 255 - self.alpha)
+
+    def draw(self):
+        state = (self.alpha, self.glitch_frame, [widget.state for widget in self.widgets])
+        if state == self.drawn_state:
+            return
+        self.drawn_state = state
+        self.compose()
+        pygame.display.flip()
+
+    def fade_out(self):
+        """Animação de saída: escurece a tela em ~0,5 s"""
+        for alpha in range(0, 255, 15):
+            self.compose()
+            self.overlay.draw(self.screen, alpha)
+            pygame.display.flip()
+            pygame.time.delay(30)
+
+
+class OptionMenu(WidgetScreen):
+    """Menu com título e opções empilhadas, navegadas com ↑/↓ e escolhidas com ENTER"""
+
+    def build(self, font, title, options, colors):
+        # colors: as cores de Button; o título usa colors['text']
+        self.options = options
+        self.selected = 0
+        center_x = self.screen.get_width()//2
+        self.title = Label(font, title, colors['text'], (center_x, 100), glitchy=True)
+        self.buttons = [
+            Button(font, option, (center_x, 200 + i * 60), colors)
+            for i, option in enumerate(options)
+        ]
+        self.widgets = [self.title] + self.buttons
+        self.select(0)
+
+    def select(self, index):
+        self.selected = index % len(self.options)
+        for i, button in enumerate(self.buttons):
+            button.selected = i == self.selected
+
+    def handle_event(self, event):
+        """Retorna a opção escolhida com ENTER, ou None"""
+        super().handle_event(event)
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_UP:
+                self.select(self.selected - 1)
+                self.start_glitch()
+            elif event.key == pygame.K_DOWN:
+                self.select(self.selected + 1)
+                self.start_glitch()
+            elif event.key == pygame.K_RETURN:
+                self.start_glitch()
+                return self.options[self.selected]
+        return None